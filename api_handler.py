@@ -3,58 +3,88 @@
 API handler for the recommendation chatbot.
 This script processes a query and returns recommendations as JSON.
 """
+import os
 import sys
-import json
+import socket
+import orjson
 import logging
-from data_loader import DataLoader
-from nlp_processor import NLPProcessor
-from recommendation_engine import RecommendationEngine
+import threading
+import copy
+from functools import lru_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
-def get_recommendations(query):
+# The engine keeps per-call state (suggested_alternatives), so a single lock
+# guards both first-time initialization and each recommendation call.
+_engine_lock = threading.Lock()
+
+# Engine method and response category for each query type
+_DISPATCH = {
+    'restaurant': ('recommend_restaurants', 'restaurants'),
+    'hotel': ('recommend_hotels', 'hotels'),
+    'vehicle': ('recommend_vehicles', 'vehicles'),
+}
+
+# Unix socket served by api_server.py
+SOCKET_PATH = os.environ.get('RECOMMENDATION_SOCKET', '/tmp/recommendation_api.sock')
+
+@lru_cache(maxsize=1024)
+def _compute_recommendations(query_key):
     """
-    Process a query and return recommendations.
+    Run the NLP and recommendation pipeline for a lowercased query.
     
     Args:
-        query (str): The user's query string
+        query_key (str): The lowercased query string
         
     Returns:
-        dict: A dictionary containing the recommendations and metadata
+        tuple: (query_type, category, filters, recommendations, alternatives)
     """
-    try:
-        # Initialize the components
-        data_loader = DataLoader()
-        restaurants_data = data_loader.load_restaurants_data()
-        hotels_data = data_loader.load_hotels_data()
-        vehicles_data = data_loader.load_vehicles_data()
-        
-        nlp_processor = NLPProcessor()
-        recommendation_engine = RecommendationEngine(restaurants_data, hotels_data, vehicles_data)
-        
-        # Process the query
-        query_type, filters = nlp_processor.process_query(query)
-        
+    # Imported here so the command-line client can skip pandas when the server is up
+    import engine_factory
+    
+    # Reuse the components loaded by earlier calls
+    with _engine_lock:
+        nlp_processor = engine_factory.get_nlp()
+        recommendation_engine = engine_factory.get_engine()
+    
+    # Process the query
+    query_type, filters = nlp_processor.process_query(query_key)
+    
+    with _engine_lock:
         # Generate recommendations based on query type
-        if query_type == 'restaurant':
-            recommendations = recommendation_engine.recommend_restaurants(filters)
-            category = 'restaurants'
-        elif query_type == 'hotel':
-            recommendations = recommendation_engine.recommend_hotels(filters)
-            category = 'hotels'
-        elif query_type == 'vehicle':
-            recommendations = recommendation_engine.recommend_vehicles(filters)
-            category = 'vehicles'
+        method_name, category = _DISPATCH.get(query_type, (None, 'unknown'))
+        if method_name:
+            recommendations = getattr(recommendation_engine, method_name)(filters)
         else:
             recommendations = []
-            category = 'unknown'
         
         # Extract alternatives if available
         alternatives = None
-        if hasattr(recommendation_engine, 'suggested_alternatives') and recommendation_engine.suggested_alternatives:
-            alternatives = recommendation_engine.suggested_alternatives
+        if recommendation_engine.suggested_alternatives:
+            alternatives = list(recommendation_engine.suggested_alternatives)
+    
+    return query_type, category, filters, recommendations, alternatives
+
+def get_recommendations(query):
+    """
+    Process a query and return recommendations.
+    
+    Args:
+        query (str): The user's query string
+        
+    Returns:
+        dict: A dictionary containing the recommendations and metadata
+    """
+    try:
+        # process_query lowercases the query first, so queries differing only in case share an entry
+        query_type, category, filters, recommendations, alternatives = _compute_recommendations(query.lower())
+        
+        # Copy the cached objects so callers can't modify them
+        filters = copy.deepcopy(filters)
+        recommendations = list(recommendations)
+        alternatives = list(alternatives) if alternatives else None
         
         # Prepare the response
         response = {
@@ -69,7 +99,7 @@ def get_recommendations(query):
         
         if alternatives:
             response['alternatives'] = alternatives
-            
+        
         return response
         
     except Exception as e:
@@ -80,6 +110,39 @@ def get_recommendations(query):
             'query': query
         }
 
+def _query_server(query):
+    """
+    Send a query to a running api_server.py.
+    
+    Args:
+        query (str): The user's query string
+        
+    Returns:
+        bytes: The JSON response, or None if no server is available
+    """
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(SOCKET_PATH):
+        return None
+    
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(30)
+            client.connect(SOCKET_PATH)
+            client.sendall(query.encode('utf-8'))
+            client.shutdown(socket.SHUT_WR)
+            
+            chunks = []
+            while True:
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        
+        return b"".join(chunks) or None
+        
+    except OSError as e:
+        logger.warning(f"Recommendation server unavailable, handling query in-process: {str(e)}")
+        return None
+
 if __name__ == "__main__":
     # Check if a query was provided as a command-line argument
     if len(sys.argv) < 2:
@@ -88,10 +151,17 @@ if __name__ == "__main__":
             'success': False,
             'error': 'No query provided'
         }
+        output = orjson.dumps(result)
     else:
         # Get the query from command-line arguments
         query = sys.argv[1]
-        result = get_recommendations(query)
+        
+        # Prefer a running api_server.py, which already has everything loaded
+        output = _query_server(query)
+        if output is None:
+            result = get_recommendations(query)
+            output = orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY)
     
-    # Print the result as JSON to stdout
-    print(json.dumps(result))
\ No newline at end of file
+    # Print the result as JSON to stdout, after anything already printed
+    sys.stdout.flush()
+    sys.stdout.buffer.write(output + b"\n")
\ No newline at end of file
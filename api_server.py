@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""
+Long-running recommendation server for api_handler.py.
+Keeps the datasets and NLP processor loaded and answers queries over a Unix socket,
+so each `python api_handler.py <query>` call skips the startup cost.
+"""
+import os
+import orjson
+import logging
+import socketserver
+import engine_factory
+from api_handler import SOCKET_PATH, get_recommendations
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+class QueryHandler(socketserver.StreamRequestHandler):
+    """Read one query from the connection and write back the JSON result."""
+    
+    def handle(self):
+        """Answer a single query; the client closes its write side when done sending."""
+        query = self.rfile.read().decode('utf-8')
+        result = get_recommendations(query)
+        self.wfile.write(orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY))
+
+def main():
+    """Load the engine and serve queries until interrupted."""
+    # Load everything before accepting connections so the first query is fast
+    engine_factory.warmup()
+    
+    # Remove a socket left behind by a previous run
+    if os.path.exists(SOCKET_PATH):
+        os.remove(SOCKET_PATH)
+    
+    with socketserver.ThreadingUnixStreamServer(SOCKET_PATH, QueryHandler) as server:
+        logger.info(f"Recommendation server listening on {SOCKET_PATH}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Shutting down recommendation server")
+        finally:
+            os.remove(SOCKET_PATH)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,15 @@
+#!/usr/bin/env python
+"""
+Convert the source CSV files to preprocessed Parquet files.
+
+DataLoader reads the Parquet files when they are at least as new as the CSVs,
+so rerun this script whenever a CSV in attached_assets changes.
+"""
+import logging
+from data_loader import DataLoader
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+print("Converting CSV data to Parquet...")
+DataLoader().convert_to_parquet()
+print("Conversion complete.")
@@ -2,6 +2,8 @@
 Module for loading and preprocessing data from CSV files.
 """
 import os
+import json
+import numpy as np
 import pandas as pd
 import logging
 import ast
@@ -9,6 +11,99 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Columns read by the recommendation engine and the result formatters
+RESTAURANT_COLUMNS = [
+    'name', 'address', 'Phone', 'price_range_from', 'price_range_to',
+    'cuisines', 'rating', 'review_count'
+]
+HOTEL_COLUMNS = [
+    'name', 'description', 'price', 'rating', 'category', 'amenities', 'location'
+]
+VEHICLE_COLUMNS = [
+    'name', 'type', 'Preference', 'Passengers', 'Ratings', 'pricePerDay',
+    'pricePerHour', 'pickupLocation', 'dropOffLocation', 'model_info'
+]
+
+# Columns read from the source CSV files; model_info is parsed from the raw model column
+RESTAURANT_CSV_COLUMNS = RESTAURANT_COLUMNS
+HOTEL_CSV_COLUMNS = HOTEL_COLUMNS
+VEHICLE_CSV_COLUMNS = [column for column in VEHICLE_COLUMNS if column != 'model_info'] + ['model']
+
+# Columns holding dicts, which Parquet and Feather files store as JSON text
+JSON_COLUMNS = ['model_info']
+
+# CSV files larger than this are read and cleaned in chunks to bound peak memory
+CSV_CHUNK_THRESHOLD = 64 * 1024 * 1024
+CSV_CHUNK_ROWS = 200_000
+
+_COLOR_RE = re.compile(r"'color': '([^']+)'")
+
+def _norm_str(series):
+    """
+    Convert a column to lowercase strings, with missing values as empty strings.
+    
+    Args:
+        series (pandas.Series): The column to normalize
+        
+    Returns:
+        pandas.Series: The normalized column, as object dtype
+    """
+    return series.fillna('').astype(str).str.lower()
+
+def _downcast(series):
+    """
+    Narrow a numeric column to 32 bits when that loses no information.
+    
+    Integer columns become int32 if every value fits, and float columns become
+    float32 only if every value survives the round trip exactly, so filters and
+    displayed values are unchanged.
+    
+    Args:
+        series (pandas.Series): A numeric column
+        
+    Returns:
+        pandas.Series: The narrowed column, or the original if narrowing would be lossy
+    """
+    if pd.api.types.is_integer_dtype(series):
+        int32 = np.iinfo(np.int32)
+        if series.between(int32.min, int32.max).all():
+            return series.astype('int32')
+    elif pd.api.types.is_float_dtype(series):
+        narrowed = series.astype('float32')
+        if (narrowed.astype('float64') == series)[series.notna()].all():
+            return narrowed
+    return series
+
+def _parse_model_info(model_str, json_str):
+    """
+    Parse a vehicle model string into a dictionary.
+    
+    Args:
+        model_str (str): The raw model string (a Python dict literal)
+        json_str (str): The same string with single quotes swapped for double quotes
+        
+    Returns:
+        dict: Parsed model information, or an empty dict if it can't be parsed
+    """
+    if model_str == '':
+        return {}
+    
+    try:
+        # Most model strings only hold quoted strings and numbers, which json parses far faster
+        return json.loads(json_str)
+    except ValueError:
+        pass
+    
+    try:
+        # Try to safely evaluate the string as a dictionary
+        return ast.literal_eval(model_str)
+    except (SyntaxError, ValueError):
+        # If that fails, try to extract color information with regex
+        colors = _COLOR_RE.findall(model_str)
+        if colors:
+            return {'colors': colors}
+        return {}
+
 class DataLoader:
     """Class for loading and preprocessing data from CSV files."""
     
@@ -18,6 +113,14 @@ class DataLoader:
         self.restaurants_file = os.path.join(self.data_dir, "tripadvisorr.csv")
         self.hotels_file = os.path.join(self.data_dir, "hotels_data.csv")
         self.vehicles_file = os.path.join(self.data_dir, "vehicles_data.csv")
+        
+        # Preprocessed Parquet copies written by convert_to_parquet.py
+        self.restaurants_parquet = os.path.join(self.data_dir, "tripadvisorr.parquet")
+        self.hotels_parquet = os.path.join(self.data_dir, "hotels_data.parquet")
+        self.vehicles_parquet = os.path.join(self.data_dir, "vehicles_data.parquet")
+        
+        # Feather copies of the cleaned CSV data, used when no Parquet file is available
+        self.cache_dir = os.path.join(self.data_dir, ".cache")
     
     def load_restaurants_data(self):
         """
@@ -27,27 +130,12 @@ class DataLoader:
             pandas.DataFrame: Preprocessed restaurant data
         """
         try:
-            logger.info(f"Loading restaurant data from {self.restaurants_file}")
-            restaurants_df = pd.read_csv(self.restaurants_file)
-            
-            # Clean and preprocess data
-            # Convert price range columns to numeric
-            restaurants_df['price_range_from'] = pd.to_numeric(restaurants_df['price_range_from'], errors='coerce')
-            restaurants_df['price_range_to'] = pd.to_numeric(restaurants_df['price_range_to'], errors='coerce')
-            
-            # Convert rating to numeric
-            restaurants_df['rating'] = pd.to_numeric(restaurants_df['rating'], errors='coerce')
-            
-            # Convert review counts to numeric
-            restaurants_df['review_count'] = pd.to_numeric(restaurants_df['review_count'], errors='coerce')
-            
-            # Fill NaN values with appropriate defaults
-            restaurants_df['price_range_from'] = restaurants_df['price_range_from'].fillna(0)
-            restaurants_df['price_range_to'] = restaurants_df['price_range_to'].fillna(1000)  # Default upper price
-            
-            # Lowercase address and cuisines for easier searching
-            restaurants_df['address'] = restaurants_df['address'].fillna('').astype(str).str.lower()
-            restaurants_df['cuisines'] = restaurants_df['cuisines'].fillna('').astype(str).str.lower()
+            if self._parquet_is_fresh(self.restaurants_parquet, self.restaurants_file):
+                logger.info(f"Loading restaurant data from {self.restaurants_parquet}")
+                restaurants_df = self._read_parquet(self.restaurants_parquet, RESTAURANT_COLUMNS)
+            else:
+                logger.info(f"Loading restaurant data from {self.restaurants_file}")
+                restaurants_df = self._load_csv(self.restaurants_file, RESTAURANT_CSV_COLUMNS, self._preprocess_restaurants)
             
             logger.info(f"Successfully loaded {len(restaurants_df)} restaurants")
             return restaurants_df
@@ -64,25 +152,12 @@ class DataLoader:
             pandas.DataFrame: Preprocessed hotel data
         """
         try:
-            logger.info(f"Loading hotel data from {self.hotels_file}")
-            hotels_df = pd.read_csv(self.hotels_file)
-            
-            # Clean and preprocess data
-            # Convert price to numeric
-            hotels_df['price'] = pd.to_numeric(hotels_df['price'], errors='coerce')
-            
-            # Convert rating to numeric
-            hotels_df['rating'] = pd.to_numeric(hotels_df['rating'], errors='coerce')
-            
-            # Process description and location fields
-            hotels_df['description'] = hotels_df['description'].fillna('').astype(str)
-            hotels_df['location'] = hotels_df['location'].fillna('').astype(str).str.lower()
-            
-            # Process amenities
-            hotels_df['amenities'] = hotels_df['amenities'].fillna('').astype(str).str.lower()
-            
-            # Process category
-            hotels_df['category'] = hotels_df['category'].fillna('').astype(str).str.lower()
+            if self._parquet_is_fresh(self.hotels_parquet, self.hotels_file):
+                logger.info(f"Loading hotel data from {self.hotels_parquet}")
+                hotels_df = self._read_parquet(self.hotels_parquet, HOTEL_COLUMNS)
+            else:
+                logger.info(f"Loading hotel data from {self.hotels_file}")
+                hotels_df = self._load_csv(self.hotels_file, HOTEL_CSV_COLUMNS, self._preprocess_hotels)
             
             logger.info(f"Successfully loaded {len(hotels_df)} hotels")
             return hotels_df
@@ -99,46 +174,12 @@ class DataLoader:
             pandas.DataFrame: Preprocessed vehicle rental data
         """
         try:
-            logger.info(f"Loading vehicle data from {self.vehicles_file}")
-            vehicles_df = pd.read_csv(self.vehicles_file)
-            
-            # Clean and preprocess data
-            # Convert price fields to numeric
-            vehicles_df['pricePerDay'] = pd.to_numeric(vehicles_df['pricePerDay'], errors='coerce')
-            vehicles_df['pricePerHour'] = pd.to_numeric(vehicles_df['pricePerHour'], errors='coerce')
-            
-            # Convert rating to numeric
-            vehicles_df['Ratings'] = pd.to_numeric(vehicles_df['Ratings'], errors='coerce')
-            
-            # Convert passengers to numeric
-            vehicles_df['Passengers'] = pd.to_numeric(vehicles_df['Passengers'], errors='coerce')
-            
-            # Process pickup and dropoff locations
-            vehicles_df['pickupLocation'] = vehicles_df['pickupLocation'].fillna('').astype(str).str.lower()
-            vehicles_df['dropOffLocation'] = vehicles_df['dropOffLocation'].fillna('').astype(str).str.lower()
-            
-            # Process preference
-            vehicles_df['Preference'] = vehicles_df['Preference'].fillna('').astype(str).str.lower()
-            
-            # Process vehicle type
-            vehicles_df['type'] = vehicles_df['type'].fillna('').astype(str).str.lower()
-            
-            # Process model information (attempt to safely parse model json strings)
-            def parse_model_info(model_str):
-                if pd.isna(model_str) or model_str == '':
-                    return {}
-                
-                try:
-                    # Try to safely evaluate the string as a dictionary
-                    return ast.literal_eval(model_str)
-                except (SyntaxError, ValueError):
-                    # If that fails, try to extract color information with regex
-                    colors = re.findall(r"'color': '([^']+)'", model_str)
-                    if colors:
-                        return {'colors': colors}
-                    return {}
-            
-            vehicles_df['model_info'] = vehicles_df['model'].apply(parse_model_info)
+            if self._parquet_is_fresh(self.vehicles_parquet, self.vehicles_file):
+                logger.info(f"Loading vehicle data from {self.vehicles_parquet}")
+                vehicles_df = self._read_parquet(self.vehicles_parquet, VEHICLE_COLUMNS)
+            else:
+                logger.info(f"Loading vehicle data from {self.vehicles_file}")
+                vehicles_df = self._load_csv(self.vehicles_file, VEHICLE_CSV_COLUMNS, self._preprocess_vehicles)
             
             logger.info(f"Successfully loaded {len(vehicles_df)} vehicles")
             return vehicles_df
@@ -146,3 +187,298 @@ class DataLoader:
         except Exception as e:
             logger.error(f"Error loading vehicle data: {str(e)}")
             raise
+    
+    def convert_to_parquet(self):
+        """
+        Preprocess the source CSV files and write them out as Parquet.
+        
+        The Parquet files hold the already-cleaned data, so later loads skip
+        CSV parsing and all of the preprocessing steps.
+        """
+        restaurants_df = self._read_and_preprocess(self.restaurants_file, RESTAURANT_CSV_COLUMNS, self._preprocess_restaurants)
+        self._encode_json_columns(restaurants_df).to_parquet(self.restaurants_parquet, compression='zstd')
+        logger.info(f"Wrote {len(restaurants_df)} restaurants to {self.restaurants_parquet}")
+        
+        hotels_df = self._read_and_preprocess(self.hotels_file, HOTEL_CSV_COLUMNS, self._preprocess_hotels)
+        self._encode_json_columns(hotels_df).to_parquet(self.hotels_parquet, compression='zstd')
+        logger.info(f"Wrote {len(hotels_df)} hotels to {self.hotels_parquet}")
+        
+        vehicles_df = self._read_and_preprocess(self.vehicles_file, VEHICLE_CSV_COLUMNS, self._preprocess_vehicles)
+        self._encode_json_columns(vehicles_df).to_parquet(self.vehicles_parquet, compression='zstd')
+        logger.info(f"Wrote {len(vehicles_df)} vehicles to {self.vehicles_parquet}")
+    
+    def _read_parquet(self, parquet_file, columns):
+        """
+        Read the needed columns of a preprocessed Parquet file.
+        
+        Args:
+            parquet_file (str): Path to the preprocessed Parquet file
+            columns (list): Columns to read
+            
+        Returns:
+            pandas.DataFrame: Preprocessed data
+        """
+        df = self._restore_nan(pd.read_parquet(parquet_file, columns=columns))
+        return self._decode_json_columns(df)
+    
+    def _read_csv(self, csv_file, columns):
+        """
+        Parse the needed columns of a raw CSV file with pyarrow's multithreaded reader.
+        
+        Args:
+            csv_file (str): Path to the source CSV file
+            columns (list): Columns to read
+            
+        Returns:
+            pandas.DataFrame: Raw data
+        """
+        return self._restore_nan(pd.read_csv(csv_file, engine='pyarrow', usecols=columns))
+    
+    def _restore_nan(self, df):
+        """
+        Replace the None that Arrow hands back for missing strings with NaN.
+        
+        Args:
+            df (pandas.DataFrame): Data read through pyarrow
+            
+        Returns:
+            pandas.DataFrame: The same data with missing values as NaN
+        """
+        return df.where(df.notna(), np.nan)
+    
+    def _encode_json_columns(self, df):
+        """
+        Serialize dict columns to JSON text for writing to Arrow-based formats.
+        
+        Args:
+            df (pandas.DataFrame): Preprocessed data
+            
+        Returns:
+            pandas.DataFrame: A copy of the data with dict columns as JSON strings
+        """
+        columns = [column for column in JSON_COLUMNS if column in df.columns]
+        return df.assign(**{column: df[column].map(json.dumps) for column in columns})
+    
+    def _decode_json_columns(self, df):
+        """
+        Parse the JSON text columns written by _encode_json_columns back into dicts.
+        
+        Args:
+            df (pandas.DataFrame): Data read from a Parquet or Feather file
+            
+        Returns:
+            pandas.DataFrame: The data with dict columns restored
+        """
+        for column in JSON_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].map(json.loads)
+        return df
+    
+    def _load_csv(self, csv_file, columns, preprocess):
+        """
+        Load and preprocess a CSV file, reusing a Feather copy of the cleaned data when possible.
+        
+        The copy is only used when its sidecar file records the CSV's current mtime.
+        
+        Args:
+            csv_file (str): Path to the source CSV file
+            columns (list): Columns to read from the CSV
+            preprocess (callable): Cleaning function applied to the raw DataFrame
+            
+        Returns:
+            pandas.DataFrame: Preprocessed data
+        """
+        cache_file = os.path.join(self.cache_dir, os.path.basename(csv_file) + ".feather")
+        mtime_file = cache_file + ".mtime"
+        csv_mtime = repr(os.path.getmtime(csv_file))
+        
+        if os.path.exists(cache_file) and os.path.exists(mtime_file):
+            with open(mtime_file) as f:
+                if f.read() == csv_mtime:
+                    return self._decode_json_columns(self._restore_nan(pd.read_feather(cache_file)))
+        
+        df = self._read_and_preprocess(csv_file, columns, preprocess)
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if os.path.exists(mtime_file):
+                os.remove(mtime_file)
+            self._encode_json_columns(df).to_feather(cache_file)
+            # Written last, so an interrupted write never looks valid
+            with open(mtime_file, 'w') as f:
+                f.write(csv_mtime)
+        except OSError as e:
+            # The cache is only an optimization, so a read-only checkout still works
+            logger.warning(f"Could not write cache file {cache_file}: {str(e)}")
+        
+        return df
+    
+    def _read_and_preprocess(self, csv_file, columns, preprocess):
+        """
+        Read and clean a CSV file, one chunk at a time if the file is large.
+        
+        Args:
+            csv_file (str): Path to the source CSV file
+            columns (list): Columns to read from the CSV
+            preprocess (callable): Cleaning function applied to the raw DataFrame
+            
+        Returns:
+            pandas.DataFrame: Preprocessed data
+        """
+        if os.path.getsize(csv_file) <= CSV_CHUNK_THRESHOLD:
+            return preprocess(self._read_csv(csv_file, columns))
+        
+        # The cleaning steps are all column-wise, so cleaning each chunk gives the same result
+        logger.info(f"Reading {csv_file} in chunks of {CSV_CHUNK_ROWS} rows")
+        chunks = [preprocess(chunk) for chunk in pd.read_csv(csv_file, usecols=columns, chunksize=CSV_CHUNK_ROWS)]
+        df = pd.concat(chunks, ignore_index=True)
+        
+        # Chunks with different categories concatenate to object dtype, so restore the categoricals
+        for column in chunks[0].select_dtypes('category').columns:
+            df[column] = df[column].astype('category')
+        
+        return df
+    
+    def _parquet_is_fresh(self, parquet_file, csv_file):
+        """
+        Check whether a Parquet copy exists and is at least as new as its CSV source.
+        
+        Args:
+            parquet_file (str): Path to the preprocessed Parquet file
+            csv_file (str): Path to the source CSV file
+            
+        Returns:
+            bool: True if the Parquet file can be used instead of the CSV
+        """
+        if not os.path.exists(parquet_file):
+            return False
+        
+        if os.path.getmtime(parquet_file) < os.path.getmtime(csv_file):
+            logger.warning(f"{parquet_file} is older than {csv_file}, falling back to CSV")
+            return False
+        
+        return True
+    
+    def _preprocess_restaurants(self, restaurants_df):
+        """
+        Clean raw restaurant data.
+        
+        Args:
+            restaurants_df (pandas.DataFrame): Raw restaurant data
+            
+        Returns:
+            pandas.DataFrame: Preprocessed restaurant data
+        """
+        # Clean and preprocess data
+        # Convert price range columns to numeric
+        restaurants_df['price_range_from'] = pd.to_numeric(restaurants_df['price_range_from'], errors='coerce')
+        restaurants_df['price_range_to'] = pd.to_numeric(restaurants_df['price_range_to'], errors='coerce')
+        
+        # Convert rating to numeric
+        restaurants_df['rating'] = pd.to_numeric(restaurants_df['rating'], errors='coerce')
+        
+        # Convert review counts to numeric
+        restaurants_df['review_count'] = pd.to_numeric(restaurants_df['review_count'], errors='coerce')
+        
+        # Use 32-bit columns where the values allow it
+        for column in ['price_range_from', 'price_range_to', 'rating', 'review_count']:
+            restaurants_df[column] = _downcast(restaurants_df[column])
+        
+        # Fill NaN values with appropriate defaults
+        restaurants_df['price_range_from'] = restaurants_df['price_range_from'].fillna(0)
+        restaurants_df['price_range_to'] = restaurants_df['price_range_to'].fillna(1000)  # Default upper price
+        
+        # Lowercase address and cuisines for easier searching
+        restaurants_df['address'] = _norm_str(restaurants_df['address'])
+        restaurants_df['cuisines'] = _norm_str(restaurants_df['cuisines'])
+        
+        # Cuisine lists repeat a lot, so filters only need to test each distinct value once
+        restaurants_df['cuisines'] = restaurants_df['cuisines'].astype('category')
+        
+        return restaurants_df
+    
+    def _preprocess_hotels(self, hotels_df):
+        """
+        Clean raw hotel data.
+        
+        Args:
+            hotels_df (pandas.DataFrame): Raw hotel data
+            
+        Returns:
+            pandas.DataFrame: Preprocessed hotel data
+        """
+        # Clean and preprocess data
+        # Convert price to numeric
+        hotels_df['price'] = pd.to_numeric(hotels_df['price'], errors='coerce')
+        
+        # Convert rating to numeric
+        hotels_df['rating'] = pd.to_numeric(hotels_df['rating'], errors='coerce')
+        
+        # Use 32-bit columns where the values allow it
+        for column in ['price', 'rating']:
+            hotels_df[column] = _downcast(hotels_df[column])
+        
+        # Process description and location fields
+        hotels_df['description'] = hotels_df['description'].fillna('').astype(str)
+        hotels_df['location'] = _norm_str(hotels_df['location'])
+        
+        # Process amenities
+        hotels_df['amenities'] = _norm_str(hotels_df['amenities'])
+        
+        # Process category
+        hotels_df['category'] = _norm_str(hotels_df['category'])
+        
+        # Store low-cardinality columns as categoricals
+        for column in ['location', 'category']:
+            hotels_df[column] = hotels_df[column].astype('category')
+        
+        return hotels_df
+    
+    def _preprocess_vehicles(self, vehicles_df):
+        """
+        Clean raw vehicle rental data.
+        
+        Args:
+            vehicles_df (pandas.DataFrame): Raw vehicle rental data
+            
+        Returns:
+            pandas.DataFrame: Preprocessed vehicle rental data
+        """
+        # Clean and preprocess data
+        # Convert price fields to numeric
+        vehicles_df['pricePerDay'] = pd.to_numeric(vehicles_df['pricePerDay'], errors='coerce')
+        vehicles_df['pricePerHour'] = pd.to_numeric(vehicles_df['pricePerHour'], errors='coerce')
+        
+        # Convert rating to numeric
+        vehicles_df['Ratings'] = pd.to_numeric(vehicles_df['Ratings'], errors='coerce')
+        
+        # Convert passengers to numeric
+        vehicles_df['Passengers'] = pd.to_numeric(vehicles_df['Passengers'], errors='coerce')
+        
+        # Use 32-bit columns where the values allow it
+        for column in ['pricePerDay', 'pricePerHour', 'Ratings', 'Passengers']:
+            vehicles_df[column] = _downcast(vehicles_df[column])
+        
+        # Process pickup and dropoff locations
+        vehicles_df['pickupLocation'] = _norm_str(vehicles_df['pickupLocation'])
+        vehicles_df['dropOffLocation'] = _norm_str(vehicles_df['dropOffLocation'])
+        
+        # Process preference
+        vehicles_df['Preference'] = _norm_str(vehicles_df['Preference'])
+        
+        # Process vehicle type
+        vehicles_df['type'] = _norm_str(vehicles_df['type'])
+        
+        # Store low-cardinality columns as categoricals
+        for column in ['pickupLocation', 'dropOffLocation', 'Preference', 'type']:
+            vehicles_df[column] = vehicles_df[column].astype('category')
+        
+        # Process model information (attempt to safely parse model json strings)
+        models = vehicles_df['model'].fillna('').astype(str)
+        json_models = models.str.replace("'", '"', regex=False)
+        vehicles_df['model_info'] = [
+            _parse_model_info(model_str, json_str)
+            for model_str, json_str in zip(models.to_numpy(), json_models.to_numpy())
+        ]
+        
+        return vehicles_df
@@ -0,0 +1,49 @@
+"""
+Shared construction of the NLP processor and recommendation engine.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from data_loader import DataLoader
+from nlp_processor import NLPProcessor
+from recommendation_engine import RecommendationEngine
+
+@lru_cache(maxsize=1)
+def get_engine():
+    """
+    Load the datasets once and build the shared recommendation engine.
+    
+    Returns:
+        RecommendationEngine: Engine over the preprocessed datasets
+    """
+    data_loader = DataLoader()
+    
+    # The datasets are independent and the readers release the GIL while parsing
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        restaurants_future = executor.submit(data_loader.load_restaurants_data)
+        hotels_future = executor.submit(data_loader.load_hotels_data)
+        vehicles_future = executor.submit(data_loader.load_vehicles_data)
+        
+        return RecommendationEngine(
+            restaurants_future.result(),
+            hotels_future.result(),
+            vehicles_future.result()
+        )
+
+@lru_cache(maxsize=1)
+def get_nlp():
+    """
+    Build the shared NLP processor, recognizing the names in the engine's data.
+    
+    Returns:
+        NLPProcessor: The query processor
+    """
+    engine = get_engine()
+    return NLPProcessor(engine.hotels_data['name'], engine.vehicles_data['name'])
+
+def warmup():
+    """
+    Build the shared components and run one query through the NLP processor,
+    so the first real request doesn't pay for loading and lazy initialization.
+    """
+    get_engine()
+    get_nlp().process_query("warmup")
\ No newline at end of file
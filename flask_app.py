@@ -1,8 +1,18 @@
-from flask import Flask, request, jsonify
+import orjson
+from flask import Flask, Response, request, jsonify
+import engine_factory
 from api_handler import get_recommendations
 
 app = Flask(__name__)
 
+# Load the data and NLP processor now rather than on the first request
+engine_factory.warmup()
+
+def orjson_response(payload, status=200):
+    # orjson encodes straight to bytes and handles numpy scalars from pandas rows
+    body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return Response(body, status=status, mimetype='application/json')
+
 @app.route('/api/recommendations', methods=['POST'])
 def recommendations():
     data = request.get_json()
@@ -14,9 +24,9 @@ def recommendations():
     result = get_recommendations(query)
     
     if not result.get('success', True):
-        return jsonify(result), 500
+        return orjson_response(result, 500)
 
-    return jsonify(result)
+    return orjson_response(result)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -0,0 +1,134 @@
+"""
+Module for finding many keywords in a query with a single regex pass.
+"""
+import re
+
+def _trie_pattern(node):
+    """
+    Build a regex matching the longest word stored in a character trie.
+    
+    Args:
+        node (dict): Trie node mapping characters to child nodes, with '' marking the end of a word
+        
+    Returns:
+        str: Regex pattern for the words below this node
+    """
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # A word ends here, so the longer continuations are optional
+        if len(branches) == 1 and len(pattern) > 1:
+            pattern = '(?:' + pattern + ')'
+        pattern += '?'
+    return pattern
+
+class KeywordScanner:
+    """
+    Class for matching tagged keyword groups against a query.
+    
+    A keyword is reported when it occurs anywhere in the query as a substring,
+    the same as `keyword in query`, but all groups are checked in one pass.
+    With whole_words set, a keyword must also start and end on a word boundary,
+    the same as searching for `\\b<keyword>\\b`.
+    """
+    
+    def __init__(self, groups, whole_words=False):
+        """
+        Initialize the KeywordScanner class.
+        
+        Args:
+            groups (dict): Maps each tag to the keywords belonging to it
+            whole_words (bool): Whether keywords only match as whole words
+        """
+        self.tags = list(groups)
+        self._keyword_tags = {}
+        for tag, keywords in groups.items():
+            for keyword in keywords:
+                self._keyword_tags.setdefault(keyword, []).append(tag)
+        
+        keywords = sorted(self._keyword_tags)
+        
+        # The scan only reports the longest keyword starting at each position, so
+        # each keyword also carries every shorter keyword it contains. As whole
+        # words, keywords starting later are found at their own positions, so only
+        # the prefixes ending on a word boundary inside the keyword are carried
+        if whole_words:
+            self._contained = {
+                keyword: [
+                    other for other in keywords
+                    if other == keyword or (keyword.startswith(other) and re.match(re.escape(other) + r'\b', keyword))
+                ]
+                for keyword in keywords
+            }
+        else:
+            self._contained = {
+                keyword: [other for other in keywords if other in keyword]
+                for keyword in keywords
+            }
+        
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = True
+        
+        # A lookahead so that overlapping keywords are found at every position
+        boundary = r'\b' if whole_words else ''
+        pattern = '(?=' + boundary + '(' + _trie_pattern(trie) + ')' + boundary + ')'
+        self._pattern = re.compile(pattern) if keywords else None
+    
+    def matches(self, query):
+        """
+        Find the keywords that occur in the query, regardless of group.
+        
+        Args:
+            query (str): The lowercased text to scan
+            
+        Returns:
+            set: The keywords found in the query
+        """
+        found = set()
+        if self._pattern is not None:
+            for match in self._pattern.finditer(query):
+                keyword = match.group(1)
+                if keyword not in found:
+                    found.update(self._contained[keyword])
+        return found
+    
+    def first(self, query):
+        """
+        Find the keyword that occurs earliest in the query, preferring the longest
+        one where several start at the same position.
+        
+        Args:
+            query (str): The lowercased text to scan
+            
+        Returns:
+            str or None: The first keyword found, or None if there is none
+        """
+        if self._pattern is not None:
+            for match in self._pattern.finditer(query):
+                return match.group(1)
+        return None
+    
+    def scan(self, query):
+        """
+        Find the keywords of every group that occur in the query.
+        
+        Args:
+            query (str): The lowercased user query
+            
+        Returns:
+            dict: Maps each tag to the set of its keywords found in the query
+        """
+        found = self.matches(query)
+        
+        hits = {tag: set() for tag in self.tags}
+        for keyword in found:
+            for tag in self._keyword_tags[keyword]:
+                hits[tag].add(keyword)
+        return hits
\ No newline at end of file
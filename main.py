@@ -31,41 +31,47 @@ def proxy_to_nodejs(path):
     return redirect(f"http://localhost:3000/api/{path}", code=307)
 import sys
 import logging
-from nlp_processor import NLPProcessor
-from data_loader import DataLoader
-from recommendation_engine import RecommendationEngine
+import engine_factory
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Words that end the conversation loop
+_EXIT_WORDS = frozenset({'exit', 'quit', 'bye'})
+
+# Engine method for each query type
+_RECOMMENDERS = {
+    'restaurant': 'recommend_restaurants',
+    'hotel': 'recommend_hotels',
+    'vehicle': 'recommend_vehicles',
+}
+
+_WELCOME = "\n".join([
+    "=" * 80,
+    "Welcome to the Travel Recommendation Assistant!",
+    "=" * 80,
+    "I can help you find restaurants, hotels, and vehicle rentals.",
+    "\nExample queries:",
+    "- 'Find cheap Italian restaurants in Mumbai with rating above 4'",
+    "- 'Show me the best hotels in Borivali'",
+    "- 'I need a luxury vehicle for 4 passengers'",
+    "\nType 'exit', 'quit', or 'bye' to end the conversation.",
+    "=" * 80,
+])
+
 def print_welcome_message():
     """Print welcome message with instructions for the user."""
-    print("=" * 80)
-    print("Welcome to the Travel Recommendation Assistant!")
-    print("=" * 80)
-    print("I can help you find restaurants, hotels, and vehicle rentals.")
-    print("\nExample queries:")
-    print("- 'Find cheap Italian restaurants in Mumbai with rating above 4'")
-    print("- 'Show me the best hotels in Borivali'")
-    print("- 'I need a luxury vehicle for 4 passengers'")
-    print("\nType 'exit', 'quit', or 'bye' to end the conversation.")
-    print("=" * 80)
+    print(_WELCOME)
 
 def main():
     """Main function to run the chatbot."""
     # Load data
     try:
-        data_loader = DataLoader()
-        restaurants_data = data_loader.load_restaurants_data()
-        hotels_data = data_loader.load_hotels_data()
-        vehicles_data = data_loader.load_vehicles_data()
+        recommendation_engine = engine_factory.get_engine()
         
-        # Initialize NLP processor and recommendation engine
-        nlp = NLPProcessor()
-        recommendation_engine = RecommendationEngine(
-            restaurants_data, hotels_data, vehicles_data
-        )
+        # Initialize NLP processor
+        nlp = engine_factory.get_nlp()
         
         # Print welcome message
         print_welcome_message()
@@ -76,7 +82,7 @@ def main():
             user_input = input("\n➤ ").strip()
             
             # Check if user wants to exit
-            if user_input.lower() in ['exit', 'quit', 'bye']:
+            if user_input.lower() in _EXIT_WORDS:
                 print("\nThank you for using the Travel Recommendation Assistant. Goodbye!")
                 break
             
@@ -89,18 +95,11 @@ def main():
                 query_type, filters = nlp.process_query(user_input)
                 
                 # Get recommendations based on query type and filters
-                if query_type == 'restaurant':
-                    results = recommendation_engine.recommend_restaurants(filters)
-                    
-                elif query_type == 'hotel':
-                    results = recommendation_engine.recommend_hotels(filters)
-                    
-                elif query_type == 'vehicle':
-                    results = recommendation_engine.recommend_vehicles(filters)
-                    
-                else:
+                method_name = _RECOMMENDERS.get(query_type)
+                if not method_name:
                     print("I'm not sure what you're looking for. Could you please try again with more details?")
                     continue
+                results = getattr(recommendation_engine, method_name)(filters)
                 
                 # Display results
                 if results:
@@ -108,7 +107,7 @@ def main():
                     for i, result in enumerate(results, 1):
                         print(f"\n{i}. {result}")
                     
-                    if hasattr(recommendation_engine, 'suggested_alternatives') and recommendation_engine.suggested_alternatives:
+                    if recommendation_engine.suggested_alternatives:
                         print("\nYou might also be interested in:")
                         for alt in recommendation_engine.suggested_alternatives:
                             print(f"- {alt}")
@@ -3,104 +3,317 @@ Module for natural language processing of user queries.
 """
 import re
 import logging
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+from functools import lru_cache
+from types import MappingProxyType
+from keyword_scanner import KeywordScanner
 
-# Download required NLTK data
-print("Checking NLTK data...")
-try:
-    nltk.data.find('tokenizers/punkt')
-    print("Found punkt package")
-except LookupError:
-    print("Downloading punkt package...")
-    nltk.download('punkt')
-    print("Punkt download complete")
+# Words made of letters and digits, with an optional apostrophe suffix ("don't", "women's")
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:['’][a-z0-9]+)?")
 
-try:
-    nltk.data.find('corpora/stopwords')
-    print("Found stopwords package")
-except LookupError:
-    print("Downloading stopwords package...")
-    nltk.download('stopwords')
-    print("Stopwords download complete")
-print("NLTK data setup complete.")
+# Patterns for the numeric filters; queries are lowercased before matching
+# Price bounds in one pass: "under/above X" fills 'max' or 'min' with 'value', "between X and Y" fills 'low' and 'high'
+_PRICE_RE = re.compile(
+    r'(?:(?P<max>under|below|less than|maximum|max)|(?P<min>above|over|more than|minimum|min))\s+(?:rs\.?|₹)?\s*(?P<value>\d+)'
+    r'|(?:between|from)\s+(?:rs\.?|₹)?\s*(?P<low>\d+)\s+(?:to|and|[-])\s+(?:rs\.?|₹)?\s*(?P<high>\d+)'
+)
+_RATING_MIN_RE = re.compile(r'(?:rating|rated|score)(?:\s+(?:of|above|over|more than|higher than))?\s+(\d+(?:\.\d+)?)')
+_RATING_MAX_RE = re.compile(r'(?:rating|rated)(?:\s+(?:below|under|less than|lower than))?\s+(\d+(?:\.\d+)?)')
+_PASSENGER_COUNT_RE = re.compile(r'(?:for|with|seats?)\s+(\d+)\s+(?:people|persons|passengers)')
+_LOCATION_PHRASE_RE = re.compile(r'(?:in|at|near|around)\s+(\w+\s+\w+|\w+)')
+_IN_WORD_RE = re.compile(r'in\s+(\w+)')
+_DIGIT_RE = re.compile(r'\d')
+
+_PASSENGER_PATTERNS = [
+    # "for X people/passengers/persons"
+    re.compile(r'(?:for|with)\s+(\d+)\s+(?:people|person|passenger|passengers|persons)'),
+    # "X passenger/person vehicle"
+    re.compile(r'(\d+)[- ](?:passenger|person|people|seat)'),
+    # "seats X people/passengers"
+    re.compile(r'seats?\s+(\d+)'),
+    # "capacity of/for X"
+    re.compile(r'capacity\s+(?:of|for)?\s+(\d+)'),
+    # "fits X people"
+    re.compile(r'fits?\s+(\d+)'),
+    # "that can seat X"
+    re.compile(r'that\s+can\s+seat\s+(\d+)'),
+    # "X seater"
+    re.compile(r'(\d+)[ -]seater')
+]
+
+# Common locations in Mumbai
+LOCATIONS = [
+    'mumbai', 'borivali', 'andheri', 'bandra', 'dadar', 'churchgate', 
+    'kurla', 'thane', 'powai', 'juhu', 'malad', 'goregaon', 'vikhroli',
+    'chembur', 'ghatkopar', 'kandivali', 'vile parle', 'santacruz',
+    'khar', 'marine lines', 'fort', 'mira road', 'vasai', 'virar'
+]
+
+# Known locations only match as whole words, so "comfortable" doesn't mean Fort
+_LOCATION_SCANNER = KeywordScanner({'location': LOCATIONS}, whole_words=True)
+
+# Keywords that set the price and rating levels, checked in this order
+PRICE_LEVEL_KEYWORDS = {
+    'cheap': ['cheap', 'budget', 'affordable', 'inexpensive'],
+    'expensive': ['expensive', 'luxury', 'premium', 'high-end']
+}
+RATING_LEVEL_KEYWORDS = {
+    'high': ['best', 'top', 'highest rated', 'excellent'],
+    'low': ['worst', 'lowest rated', 'bad', 'terrible']
+}
+
+# Keywords for the query intent, checked in this order
+INTENT_KEYWORDS = {
+    'cheap': ['cheap', 'budget', 'affordable', 'inexpensive', 'economical', 'low price', 'low cost'],
+    'expensive': ['expensive', 'luxury', 'premium', 'high-end', 'pricey', 'costly', 'upscale', 'fancy'],
+    'best': ['best', 'top', 'highest rated', 'highly rated', 'excellent', '5 star', 'five star', 'top rated'],
+    'worst': ['worst', 'lowest rated', 'poorly rated', 'bad', 'terrible', 'avoid']
+}
+
+# Keywords that tell _extract_intent which type-specific intents to look for
+INTENT_TOPIC_KEYWORDS = {
+    'restaurant': ['restaurant', 'food', 'place to eat'],
+    'hotel': ['hotel', 'place to stay', 'accommodation'],
+    'vehicle': ['vehicle', 'car', 'rental']
+}
+
+# Type-specific intent keywords for hotels
+AMENITIES_INTENT_KEYWORDS = ['with pool', 'free wifi', 'gym', 'fitness', 'breakfast included', 'spa', 'parking', 'pet friendly']
+CATEGORY_INTENT_KEYWORDS = ['boutique', 'resort', 'motel', 'hostel', 'bed and breakfast', 'family hotel', 'business hotel']
+
+# Type-specific intent keywords for vehicles
+VEHICLE_TYPE_INTENT_KEYWORDS = ['car', 'truck', 'van', 'bus', 'motorcycle', 'suv', 'cycle', 'bike']
+CAPACITY_INTENT_KEYWORDS = ['seats', 'passengers', 'people', 'person', 'capacity', 'for 2', 'for 4', 'for 6', 'fit']
+
+HOTEL_CATEGORIES = ['luxury', 'budget', 'family', 'business', 'resort', 'friendly']
+
+# Common hotel amenities with variations to match the dataset format
+AMENITY_MAPPING = {
+    'wifi': ['wifi', 'wi-fi', 'wi fi', 'wireless', 'internet', 'free wifi', 'free wi-fi'],
+    'pool': ['pool', 'swimming pool', 'rooftop pool', 'outdoor pool', 'indoor pool'],
+    'gym': ['gym', 'fitness center', 'fitness room', 'workout', 'exercise'],
+    'spa': ['spa', 'wellness', 'massage', 'sauna'],
+    'restaurant': ['restaurant', 'dining', 'cafe', 'eatery', 'food', 'fine dining'],
+    'bar': ['bar', 'lounge', 'pub', 'cocktail'],
+    'breakfast': ['breakfast', 'complimentary breakfast', 'free breakfast', 'morning meal'],
+    'parking': ['parking', 'free parking', 'valet', 'car park'],
+    'air conditioning': ['air conditioning', 'ac', 'a/c', 'climate control', 'air-conditioned'],
+    'room service': ['room service', '24-hour service', '24/7 service'],
+    'business': ['business center', 'conference', 'meeting rooms'],
+    'laundry': ['laundry', 'dry cleaning', 'cleaning service']
+}
+
+# Map specific vehicle types to general categories in our database
+VEHICLE_TYPE_MAPPING = {
+    'car': ['car', 'sedan', 'hatchback'],
+    'suv': ['suv', 'jeep', '4x4', 'four wheel drive', '4 wheel drive'],
+    'minivan': ['minivan', 'van', 'mpv', 'family car'],
+    'truck': ['truck', 'pickup', 'lorry'],
+    'luxury car': ['luxury car', 'premium car', 'high end car'],
+    'convertible': ['convertible', 'cabrio', 'cabriolet', 'open top'],
+    'bike': ['bike', 'motorcycle', 'scooter', 'bicycle', 'cycle'],
+    'bus': ['bus', 'coach', 'minibus']
+}
+GENERIC_VEHICLE_TYPES = ['car', 'suv', 'bike', 'motorcycle', 'bus']
+
+VEHICLE_PREFERENCE_KEYWORDS = {
+    'luxury': ['luxury', 'premium', 'high-end'],
+    'cheap': ['cheap', 'budget', 'affordable']
+}
 
 logger = logging.getLogger(__name__)
 
+def _build_name_scanner(hotel_names, vehicle_names):
+    """
+    Build a scanner over the lowercased hotel and vehicle names.
+    
+    Args:
+        hotel_names (iterable): Hotel names from the loaded data
+        vehicle_names (iterable): Vehicle names from the loaded data
+        
+    Returns:
+        KeywordScanner: Scanner with 'hotel_name', 'vehicle_name', 'short_vehicle_name'
+            and 'activa' groups
+    """
+    # Missing names (None or NaN) count as empty
+    hotel_names = {'' if name is None or name != name else str(name).lower() for name in hotel_names}
+    vehicle_names = {'' if name is None or name != name else str(name).lower() for name in vehicle_names}
+    
+    return KeywordScanner({
+        # Names of three letters or less are too likely to match inside other words
+        'hotel_name': [name for name in hotel_names if len(name) > 3],
+        'vehicle_name': [name for name in vehicle_names if len(name) > 3],
+        'short_vehicle_name': [name for name in vehicle_names if 0 < len(name) <= 3],
+        # "activa" alone should find the Activa models, whatever their full name
+        'activa': ['activa'] if any('activa' in name for name in vehicle_names) else [],
+    })
+
 class NLPProcessor:
     """Class for processing natural language queries."""
     
-    def __init__(self):
-        """Initialize the NLPProcessor class."""
-        self.restaurant_keywords = {
-            'restaurant', 'restaurants', 'food', 'eat', 'dining', 'dine',
-            'cuisine', 'meal', 'breakfast', 'lunch', 'dinner', 'cafe', 'bistro',
-            'eatery', 'pizzeria', 'steakhouse', 'bakery'
-        }
-        
-        self.hotel_keywords = {
-            'hotel', 'hotels', 'motel', 'inn', 'stay', 'accommodation', 'lodge',
-            'lodging', 'resort', 'room', 'bed', 'suite', 'guest house', 'homestay',
-            'luxury', 'budget', 'pool', 'spa', 'breakfast', 'view', 'wifi', 'star'
-        }
-        
-        self.vehicle_keywords = {
-            'vehicle', 'vehicles', 'car', 'cars', 'bike', 'bikes', 'motorcycle',
-            'scooter', 'rental', 'rentals', 'rent', 'transport', 'transportation',
-            'cab', 'taxi', 'drive', 'driving', 'ride', 'riding', 'bus', 'cycle',
-            'suv', 'sedan', 'hatchback', 'auto', 'jeep', 'truck', 'minivan', 'van'
-        }
-        
-        self.price_keywords = {
-            'cheap', 'budget', 'affordable', 'inexpensive', 'economical', 'low cost',
-            'expensive', 'premium', 'luxury', 'high-end', 'pricey', 'costly',
-            'price', 'cost', 'fee', 'rate', 'charges'
-        }
+    # Read-only keyword tables, shared by every instance
+    RESTAURANT_KEYWORDS = frozenset({
+        'restaurant', 'restaurants', 'food', 'eat', 'dining', 'dine',
+        'cuisine', 'meal', 'breakfast', 'lunch', 'dinner', 'cafe', 'bistro',
+        'eatery', 'pizzeria', 'steakhouse', 'bakery'
+    })
+    
+    HOTEL_KEYWORDS = frozenset({
+        'hotel', 'hotels', 'motel', 'inn', 'stay', 'accommodation', 'lodge',
+        'lodging', 'resort', 'room', 'bed', 'suite', 'guest house', 'homestay',
+        'luxury', 'budget', 'pool', 'spa', 'breakfast', 'view', 'wifi', 'star'
+    })
+    
+    VEHICLE_KEYWORDS = frozenset({
+        'vehicle', 'vehicles', 'car', 'cars', 'bike', 'bikes', 'motorcycle',
+        'scooter', 'rental', 'rentals', 'rent', 'transport', 'transportation',
+        'cab', 'taxi', 'drive', 'driving', 'ride', 'riding', 'bus', 'cycle',
+        'suv', 'sedan', 'hatchback', 'auto', 'jeep', 'truck', 'minivan', 'van'
+    })
+    
+    PRICE_KEYWORDS = frozenset({
+        'cheap', 'budget', 'affordable', 'inexpensive', 'economical', 'low cost',
+        'expensive', 'premium', 'luxury', 'high-end', 'pricey', 'costly',
+        'price', 'cost', 'fee', 'rate', 'charges'
+    })
+    
+    RATING_KEYWORDS = frozenset({
+        'best', 'top', 'highest rated', 'highly rated', 'good', 'excellent',
+        'worst', 'lowest rated', 'poorly rated', 'bad', 'terrible',
+        'rating', 'rated', 'stars', 'score'
+    })
+    
+    LOCATION_KEYWORDS = frozenset({
+        'in', 'at', 'near', 'around', 'close to', 'vicinity', 'area',
+        'neighborhood', 'zone', 'region', 'locality', 'district'
+    })
+    
+    CUISINE_TYPES = frozenset({
+        'indian', 'chinese', 'italian', 'mexican', 'japanese', 'thai',
+        'continental', 'mughlai', 'south indian', 'north indian', 'asian',
+        'american', 'mediterranean', 'middle eastern', 'lebanese', 'french',
+        'spanish', 'greek', 'korean', 'vietnamese', 'seafood', 'vegetarian',
+        'vegan', 'fusion', 'fast food', 'street food', 'pizza', 'burger',
+        'sushi', 'steak', 'bbq', 'barbecue', 'cafe', 'bakery', 'dessert'
+    })
+    
+    CUISINE_SIMILARITY = MappingProxyType({
+        'chinese': ('asian', 'japanese', 'korean', 'thai', 'vietnamese'),
+        'japanese': ('asian', 'chinese', 'korean', 'sushi'),
+        'thai': ('asian', 'chinese', 'vietnamese'),
+        'korean': ('asian', 'japanese', 'chinese'),
+        'vietnamese': ('asian', 'thai', 'chinese'),
+        'indian': ('south indian', 'north indian', 'mughlai'),
+        'south indian': ('indian', 'vegetarian'),
+        'north indian': ('indian', 'mughlai'),
+        'mughlai': ('indian', 'north indian'),
+        'italian': ('mediterranean', 'pizza', 'pasta'),
+        'mexican': ('spanish', 'american'),
+        'mediterranean': ('greek', 'lebanese', 'middle eastern', 'italian'),
+        'middle eastern': ('mediterranean', 'lebanese'),
+        'american': ('burger', 'fast food', 'bbq'),
+        'fast food': ('burger', 'american', 'street food'),
+        'street food': ('fast food',),
+        'vegetarian': ('vegan', 'south indian'),
+        'vegan': ('vegetarian',),
+        'seafood': ('asian', 'mediterranean')
+    })
+    
+    def __init__(self, hotel_names, vehicle_names):
+        """
+        Initialize the NLPProcessor class.
         
-        self.rating_keywords = {
-            'best', 'top', 'highest rated', 'highly rated', 'good', 'excellent',
-            'worst', 'lowest rated', 'poorly rated', 'bad', 'terrible',
-            'rating', 'rated', 'stars', 'score'
-        }
+        The names are required so that a processor can't silently lose direct name
+        lookups; engine_factory.get_nlp passes the names from the shared engine.
         
-        self.location_keywords = {
-            'in', 'at', 'near', 'around', 'close to', 'vicinity', 'area',
-            'neighborhood', 'zone', 'region', 'locality', 'district'
-        }
+        Args:
+            hotel_names (iterable): Hotel names to recognize in queries, taken from
+                the already loaded hotel data
+            vehicle_names (iterable): Vehicle names to recognize in queries, taken
+                from the already loaded vehicle data
+        """
+        # Instance names for the shared tables
+        self.restaurant_keywords = self.RESTAURANT_KEYWORDS
+        self.hotel_keywords = self.HOTEL_KEYWORDS
+        self.vehicle_keywords = self.VEHICLE_KEYWORDS
+        self.price_keywords = self.PRICE_KEYWORDS
+        self.rating_keywords = self.RATING_KEYWORDS
+        self.location_keywords = self.LOCATION_KEYWORDS
+        self.cuisine_types = self.CUISINE_TYPES
+        self.cuisine_similarity = self.CUISINE_SIMILARITY
+        
+        # The scanner only depends on the class tables, so instances share one
+        self._scanner = self._build_scanner()
+        self._token_types = self._build_token_types()
+        
+        # Direct name references, found in a query with a single pass
+        self._name_scanner = _build_name_scanner(hotel_names, vehicle_names)
+        
+        # Per-instance cache of processed queries, used by process_query
+        self._process_cached = lru_cache(maxsize=4096)(self._process_query)
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _build_scanner(cls):
+        """
+        Build the keyword scanner once per class and process.
         
-        self.cuisine_types = {
-            'indian', 'chinese', 'italian', 'mexican', 'japanese', 'thai',
-            'continental', 'mughlai', 'south indian', 'north indian', 'asian',
-            'american', 'mediterranean', 'middle eastern', 'lebanese', 'french',
-            'spanish', 'greek', 'korean', 'vietnamese', 'seafood', 'vegetarian',
-            'vegan', 'fusion', 'fast food', 'street food', 'pizza', 'burger',
-            'sushi', 'steak', 'bbq', 'barbecue', 'cafe', 'bakery', 'dessert'
+        Returns:
+            KeywordScanner: Scanner over every keyword group
+        """
+        # Every keyword group used to classify the query and extract filters, matched in one pass by _scan
+        groups = {
+            'restaurant': cls.RESTAURANT_KEYWORDS,
+            'hotel': cls.HOTEL_KEYWORDS,
+            'vehicle': cls.VEHICLE_KEYWORDS,
+            'cuisine': cls.CUISINE_TYPES,
+            'vehicle_hint': ['car', 'vehicle', 'suv', 'van', 'bike', 'motorbike', 'auto', 'ride'],
+            'force_hotel': ['hotel', 'swimming pool', 'pool'],
+            'force_vehicle': ['suv', 'car', 'seat', 'passenger'],
+            'stay_hint': ['room', 'stay', 'night', 'accommodation', 'swimming pool', 'pool', 'spa'],
+            'travel_hint': ['drive', 'ride', 'passenger', 'seat', 'people', 'persons', 'capacity'],
+            'location_keyword': cls.LOCATION_KEYWORDS,
+            'amenities_intent': AMENITIES_INTENT_KEYWORDS,
+            'category_intent': CATEGORY_INTENT_KEYWORDS,
+            'vehicle_type_intent': VEHICLE_TYPE_INTENT_KEYWORDS,
+            'capacity_intent': CAPACITY_INTENT_KEYWORDS,
+            'hotel_category': HOTEL_CATEGORIES,
+            'generic_vehicle_type': GENERIC_VEHICLE_TYPES,
+            'family': ['family'],
+            'couple': ['couple', 'two people'],
         }
-        
-        self.cuisine_similarity = {
-            'chinese': ['asian', 'japanese', 'korean', 'thai', 'vietnamese'],
-            'japanese': ['asian', 'chinese', 'korean', 'sushi'],
-            'thai': ['asian', 'chinese', 'vietnamese'],
-            'korean': ['asian', 'japanese', 'chinese'],
-            'vietnamese': ['asian', 'thai', 'chinese'],
-            'indian': ['south indian', 'north indian', 'mughlai'],
-            'south indian': ['indian', 'vegetarian'],
-            'north indian': ['indian', 'mughlai'],
-            'mughlai': ['indian', 'north indian'],
-            'italian': ['mediterranean', 'pizza', 'pasta'],
-            'mexican': ['spanish', 'american'],
-            'mediterranean': ['greek', 'lebanese', 'middle eastern', 'italian'],
-            'middle eastern': ['mediterranean', 'lebanese'],
-            'american': ['burger', 'fast food', 'bbq'],
-            'fast food': ['burger', 'american', 'street food'],
-            'street food': ['fast food'],
-            'vegetarian': ['vegan', 'south indian'],
-            'vegan': ['vegetarian'],
-            'seafood': ['asian', 'mediterranean']
+        tables = {
+            'price_level': PRICE_LEVEL_KEYWORDS,
+            'rating_level': RATING_LEVEL_KEYWORDS,
+            'intent': INTENT_KEYWORDS,
+            'intent_topic': INTENT_TOPIC_KEYWORDS,
+            'amenity': AMENITY_MAPPING,
+            'vehicle_type': VEHICLE_TYPE_MAPPING,
+            'preference': VEHICLE_PREFERENCE_KEYWORDS,
         }
+        for name, table in tables.items():
+            for value, keywords in table.items():
+                groups[(name, value)] = keywords
+        return KeywordScanner(groups)
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _build_token_types(cls):
+        """
+        Map each entity keyword to the query types it counts towards, once per class and process.
         
-        self.stop_words = set(stopwords.words('english'))
+        Returns:
+            dict: Maps each keyword to a tuple of query types
+        """
+        token_types = {}
+        for query_type, keywords in (('restaurant', cls.RESTAURANT_KEYWORDS),
+                                     ('hotel', cls.HOTEL_KEYWORDS),
+                                     ('vehicle', cls.VEHICLE_KEYWORDS)):
+            # Phrases such as 'guest house' never come out of the tokenizer, and are
+            # already matched as substrings by the keyword scan
+            for keyword in keywords:
+                if _TOKEN_RE.fullmatch(keyword):
+                    token_types[keyword] = token_types.get(keyword, ()) + (query_type,)
+        return token_types
     
     def process_query(self, query):
         """
@@ -109,20 +322,53 @@ class NLPProcessor:
         Args:
             query (str): The user's natural language query
             
+        Returns:
+            tuple: A tuple containing (query_type, filters)
+        """
+        # Processing only depends on the lowercased query, so repeated queries hit the cache
+        query_type, filters = self._process_cached(query.lower())
+        
+        # Copy the filters so callers can't modify the cached ones; apart from the amenities
+        # list the values are strings, numbers and tuples, so a shallow copy is enough
+        return query_type, {key: list(value) if isinstance(value, list) else value for key, value in filters.items()}
+    
+    def process_queries(self, queries):
+        """
+        Process a batch of natural language queries.
+        
+        Queries that differ only in case, within the batch or from earlier calls,
+        are processed once and served from the cache.
+        
+        Args:
+            queries (list): The user queries
+            
+        Returns:
+            list: A (query_type, filters) tuple for each query, in order
+        """
+        return [self.process_query(query) for query in queries]
+    
+    def _process_query(self, query):
+        """
+        Extract the query type and filters from a lowercased query.
+        
+        Args:
+            query (str): The lowercased user query
+            
         Returns:
             tuple: A tuple containing (query_type, filters)
         """
         try:
-            # Preprocess query
-            query = query.lower()
-            # Use simple split instead of word_tokenize
-            tokens = query.split()
+            # Split into words, dropping punctuation such as "hotel," or "cars."
+            tokens = _TOKEN_RE.findall(query)
+            
+            # Find every keyword in the query once, for all of the checks below
+            hits = self._scan(query)
             
             # Determine query type (restaurant, hotel, or vehicle)
-            query_type = self._determine_query_type(query, tokens)
+            query_type = self._determine_query_type(query, tokens, hits)
             
             # Extract filters based on query type
-            filters = self._extract_filters(query, tokens, query_type)
+            filters = self._extract_filters(query, tokens, query_type, hits)
             
             logger.info(f"Processed query: {query_type} with filters: {filters}")
             return query_type, filters
@@ -132,13 +378,14 @@ class NLPProcessor:
             # Default to restaurant search with minimal filters if processing fails
             return 'restaurant', {'query': query}
     
-    def _determine_query_type(self, query, tokens):
+    def _determine_query_type(self, query, tokens, hits):
         """
         Determine the type of query (restaurant, hotel, or vehicle).
         
         Args:
             query (str): The full user query
             tokens (list): Tokenized query
+            hits (dict): Keyword matches from _scan
             
         Returns:
             str: The query type ('restaurant', 'hotel', or 'vehicle')
@@ -146,32 +393,24 @@ class NLPProcessor:
         # First check for direct entity name references
         logger.info(f"Checking for entity names and keywords in query: {query}")
         
+        # Find every hotel and vehicle name in the query with one pass
+        names = self._name_scanner.scan(query)
+        
         # Check for specific hotel names first (they take the highest priority)
-        from data_loader import DataLoader
-        data_loader = DataLoader()
-        hotels_data = data_loader.load_hotels_data()
-        
-        # Check for specific hotel names in the query
-        for _, hotel in hotels_data.iterrows():
-            hotel_name = str(hotel.get('name', '')).lower()
-            if hotel_name and len(hotel_name) > 3 and hotel_name in query.lower():
-                logger.info(f"Found specific hotel name in query: {hotel_name}")
-                return 'hotel'
+        if names['hotel_name']:
+            logger.info(f"Found specific hotel name in query: {', '.join(sorted(names['hotel_name']))}")
+            return 'hotel'
         
-        # Check for specific vehicle names if no hotel name matches
-        vehicles_data = data_loader.load_vehicles_data()
-        for _, vehicle in vehicles_data.iterrows():
-            vehicle_name = str(vehicle.get('name', '')).lower()
-            # Check for exact name matches or partial matches for specific popular models
-            if (vehicle_name and len(vehicle_name) > 3 and vehicle_name in query.lower()) or \
-               ('activa' in query.lower() and 'activa' in vehicle_name):
-                logger.info(f"Found specific vehicle name in query: {vehicle_name}")
-                return 'vehicle'
+        # Check for specific vehicle names if no hotel name matches, or partial matches
+        # for specific popular models
+        if names['vehicle_name'] or names['activa']:
+            logger.info(f"Found specific vehicle name in query: {', '.join(sorted(names['vehicle_name'] | names['activa']))}")
+            return 'vehicle'
                 
         # If no specific name matches, count keyword matches for each entity type
-        restaurant_score = sum(1 for word in self.restaurant_keywords if word in query)
-        hotel_score = sum(1 for word in self.hotel_keywords if word in query)
-        vehicle_score = sum(1 for word in self.vehicle_keywords if word in query)
+        restaurant_score = len(hits['restaurant'])
+        hotel_score = len(hits['hotel'])
+        vehicle_score = len(hits['vehicle'])
         
         logger.info(f"Keyword scores: Restaurant={restaurant_score}, Hotel={hotel_score}, Vehicle={vehicle_score}")
         
@@ -184,35 +423,32 @@ class NLPProcessor:
             return 'vehicle'
         
         # Directly check for vehicle model names if a vehicle keyword is present
-        vehicle_keywords = ['car', 'vehicle', 'suv', 'van', 'bike', 'motorbike', 'auto', 'ride']
-        if any(keyword in query.lower() for keyword in vehicle_keywords):
-            from data_loader import DataLoader
-            data_loader = DataLoader()
-            vehicles_data = data_loader.load_vehicles_data()
-            for _, vehicle in vehicles_data.iterrows():
-                vehicle_name = vehicle.get('name', '').lower()
-                if vehicle_name in query.lower():
-                    logger.info(f"Found vehicle name match: {vehicle_name}")
-                    return 'vehicle'
-        
-        # Count keyword occurrences for each category
-        restaurant_count = sum(1 for token in tokens if token in self.restaurant_keywords)
-        hotel_count = sum(1 for token in tokens if token in self.hotel_keywords)
-        vehicle_count = sum(1 for token in tokens if token in self.vehicle_keywords)
-        
-        logger.info(f"Keyword counts - Restaurant: {restaurant_count}, Hotel: {hotel_count}, Vehicle: {vehicle_count}")
+        # (longer names were already checked above)
+        if hits['vehicle_hint'] and names['short_vehicle_name']:
+            logger.info(f"Found vehicle name match: {', '.join(sorted(names['short_vehicle_name']))}")
+            return 'vehicle'
         
         # Force hotel detection for queries containing "hotel" or "swimming pool"
-        if 'hotel' in query.lower() or 'swimming pool' in query.lower() or 'pool' in query.lower():
+        if hits['force_hotel']:
             logger.info("Force hotel detection based on explicit hotel/pool keywords")
             return 'hotel'
             
         # Force vehicle detection for specific vehicle keywords
-        if 'suv' in query.lower() or 'car' in query.lower() or 'seat' in query.lower() or 'passenger' in query.lower():
+        if hits['force_vehicle']:
             logger.info("Force vehicle detection based on explicit vehicle keywords")
             return 'vehicle'
         
         # Continue with standard detection if no exact matches were found
+        # Count keyword occurrences for each category with one lookup per token; a token
+        # can count towards more than one category (e.g. 'breakfast')
+        counts = {'restaurant': 0, 'hotel': 0, 'vehicle': 0}
+        for token in tokens:
+            for token_type in self._token_types.get(token, ()):
+                counts[token_type] += 1
+        restaurant_count, hotel_count, vehicle_count = counts['restaurant'], counts['hotel'], counts['vehicle']
+        
+        logger.info(f"Keyword counts - Restaurant: {restaurant_count}, Hotel: {hotel_count}, Vehicle: {vehicle_count}")
+        
         # Determine the most likely query type
         if restaurant_count > hotel_count and restaurant_count > vehicle_count:
             logger.info("Detected as restaurant based on keyword count")
@@ -227,21 +463,20 @@ class NLPProcessor:
             logger.info("No clear winner based on keyword count, using heuristics")
             
             # Default to restaurant if cuisine is mentioned
-            for cuisine in self.cuisine_types:
-                if cuisine in query:
-                    logger.info(f"Detected as restaurant based on cuisine: {cuisine}")
-                    return 'restaurant'
+            if hits['cuisine']:
+                logger.info(f"Detected as restaurant based on cuisine: {', '.join(sorted(hits['cuisine']))}")
+                return 'restaurant'
             
             # Additional heuristics
-            if any(word in query.lower() for word in ['room', 'stay', 'night', 'accommodation', 'swimming pool', 'pool', 'spa']):
+            if hits['stay_hint']:
                 logger.info("Detected as hotel based on accommodation keywords")
                 return 'hotel'
-            elif any(word in query.lower() for word in ['drive', 'ride', 'passenger', 'seat', 'people', 'persons', 'capacity']):
+            elif hits['travel_hint']:
                 logger.info("Detected as vehicle based on transportation keywords")
                 return 'vehicle'
                 
             # Check for numbers that might indicate passengers
-            passenger_match = re.search(r'(?:for|with|seats?)\s+(\d+)\s+(?:people|persons|passengers)', query)
+            passenger_match = _PASSENGER_COUNT_RE.search(query)
             if passenger_match:
                 logger.info("Detected as vehicle based on passenger count")
                 return 'vehicle'
@@ -250,7 +485,23 @@ class NLPProcessor:
             logger.info("Final fallback to restaurant")
             return 'restaurant'
     
-    def _extract_filters(self, query, tokens, query_type):
+    def _scan(self, query):
+        """
+        Find the keywords of every group in the query with a single pass.
+        
+        Args:
+            query (str): The lowercased user query
+            
+        Returns:
+            dict: Maps each keyword group to the set of its keywords found in the query
+        """
+        hits = self._scanner.scan(query)
+        
+        # Every numeric pattern needs a digit, so most queries can skip them entirely
+        hits['digit'] = set(_DIGIT_RE.findall(query))
+        return hits
+    
+    def _extract_filters(self, query, tokens, query_type, hits):
         """
         Extract filters from the query based on the query type.
         
@@ -258,6 +509,7 @@ class NLPProcessor:
             query (str): The full user query
             tokens (list): Tokenized query
             query_type (str): The type of query ('restaurant', 'hotel', or 'vehicle')
+            hits (dict): Keyword matches from _scan
             
         Returns:
             dict: A dictionary of filters
@@ -270,24 +522,24 @@ class NLPProcessor:
             filters['location'] = location
         
         # Extract price preferences
-        price_info = self._extract_price_info(query)
+        price_info = self._extract_price_info(query, hits)
         if price_info:
             filters.update(price_info)
         
         # Extract rating preferences
-        rating_info = self._extract_rating_info(query)
+        rating_info = self._extract_rating_info(query, hits)
         if rating_info:
             filters.update(rating_info)
         
         # Extract query intent (cheap, expensive, best, worst, etc.)
-        intent = self._extract_intent(query)
+        intent = self._extract_intent(query, hits)
         if intent:
             filters['intent'] = intent
         
         # Extract type-specific filters
         if query_type == 'restaurant':
             # Extract cuisine preferences
-            cuisine = self._extract_cuisine(query)
+            cuisine = self._extract_cuisine(query, hits)
             if cuisine:
                 filters['cuisine'] = cuisine
                 
@@ -298,25 +550,25 @@ class NLPProcessor:
         
         elif query_type == 'hotel':
             # Extract hotel category/amenities
-            category = self._extract_hotel_category(query)
+            category = self._extract_hotel_category(query, hits)
             if category:
                 filters['category'] = category
             
-            amenities = self._extract_amenities(query)
+            amenities = self._extract_amenities(query, hits)
             if amenities:
                 filters['amenities'] = amenities
         
         elif query_type == 'vehicle':
             # Extract vehicle type and passengers
-            vehicle_type = self._extract_vehicle_type(query)
+            vehicle_type = self._extract_vehicle_type(query, hits)
             if vehicle_type:
                 filters['vehicle_type'] = vehicle_type
             
-            passengers = self._extract_passengers(query)
+            passengers = self._extract_passengers(query, hits)
             if passengers:
                 filters['passengers'] = passengers
             
-            preference = self._extract_vehicle_preference(query)
+            preference = self._extract_vehicle_preference(query, hits)
             if preference:
                 filters['preference'] = preference
         
@@ -332,40 +584,28 @@ class NLPProcessor:
         Returns:
             str or None: The extracted location or None if not found
         """
-        # Common locations in Mumbai
-        locations = [
-            'mumbai', 'borivali', 'andheri', 'bandra', 'dadar', 'churchgate', 
-            'kurla', 'thane', 'powai', 'juhu', 'malad', 'goregaon', 'vikhroli',
-            'chembur', 'ghatkopar', 'kandivali', 'vile parle', 'santacruz',
-            'khar', 'marine lines', 'fort', 'mira road', 'vasai', 'virar'
-        ]
-        
-        # Look for location patterns
-        for location in locations:
-            # Check for location in the query
-            if location in query.lower():
-                return location
-            
-            # Check for location pattern "in/at/near X"
-            match = re.search(r'(?:in|at|near|around)\s+(\w+\s+\w+|\w+)', query.lower())
-            if match:
-                loc = match.group(1)
-                # Verify it's a known location
-                for known_loc in locations:
-                    if known_loc in loc:
-                        return known_loc
-                
-                # If no known location found, return the extracted one
-                return loc
+        # Known locations anywhere in the query take priority, the earliest one first
+        location = _LOCATION_SCANNER.first(query)
+        if location:
+            return location
+        
+        # Check for location pattern "in/at/near X". The phrase is made of whole words,
+        # so a known location in it would already have been found above, and a known
+        # location inside a longer word (like "fort" in "fortville") isn't a match;
+        # the phrase is returned as-is
+        match = _LOCATION_PHRASE_RE.search(query)
+        if match:
+            return match.group(1)
         
         return None
     
-    def _extract_price_info(self, query):
+    def _extract_price_info(self, query, hits):
         """
         Extract price-related information from the query.
         
         Args:
             query (str): The user query
+            hits (dict): Keyword matches from _scan
             
         Returns:
             dict or None: Dictionary with price information or None if not found
@@ -373,33 +613,42 @@ class NLPProcessor:
         price_info = {}
         
         # Check for numeric price values
-        price_match = re.search(r'(?:under|below|less than|maximum|max)\s+(?:rs\.?|₹)?\s*(\d+)', query, re.IGNORECASE)
-        if price_match:
-            price_info['max_price'] = int(price_match.group(1))
-        
-        price_match = re.search(r'(?:above|over|more than|minimum|min)\s+(?:rs\.?|₹)?\s*(\d+)', query, re.IGNORECASE)
-        if price_match:
-            price_info['min_price'] = int(price_match.group(1))
-        
-        price_match = re.search(r'(?:between|from)\s+(?:rs\.?|₹)?\s*(\d+)\s+(?:to|and|[-])\s+(?:rs\.?|₹)?\s*(\d+)', query, re.IGNORECASE)
-        if price_match:
-            price_info['min_price'] = int(price_match.group(1))
-            price_info['max_price'] = int(price_match.group(2))
+        if hits['digit']:
+            # The first bound of each kind counts, and a range overrides both bounds
+            max_match = min_match = range_match = None
+            for price_match in _PRICE_RE.finditer(query):
+                if price_match.group('max'):
+                    max_match = max_match or price_match
+                elif price_match.group('min'):
+                    min_match = min_match or price_match
+                else:
+                    range_match = range_match or price_match
+            
+            if max_match:
+                price_info['max_price'] = int(max_match.group('value'))
+            
+            if min_match:
+                price_info['min_price'] = int(min_match.group('value'))
+            
+            if range_match:
+                price_info['min_price'] = int(range_match.group('low'))
+                price_info['max_price'] = int(range_match.group('high'))
         
         # Check for price keywords
-        if 'cheap' in query or 'budget' in query or 'affordable' in query or 'inexpensive' in query:
-            price_info['price_level'] = 'cheap'
-        elif 'expensive' in query or 'luxury' in query or 'premium' in query or 'high-end' in query:
-            price_info['price_level'] = 'expensive'
+        for level in PRICE_LEVEL_KEYWORDS:
+            if hits[('price_level', level)]:
+                price_info['price_level'] = level
+                break
         
         return price_info if price_info else None
     
-    def _extract_rating_info(self, query):
+    def _extract_rating_info(self, query, hits):
         """
         Extract rating-related information from the query.
         
         Args:
             query (str): The user query
+            hits (dict): Keyword matches from _scan
             
         Returns:
             dict or None: Dictionary with rating information or None if not found
@@ -407,124 +656,105 @@ class NLPProcessor:
         rating_info = {}
         
         # Check for numeric rating values
-        rating_match = re.search(r'(?:rating|rated|score)(?:\s+(?:of|above|over|more than|higher than))?\s+(\d+(?:\.\d+)?)', query, re.IGNORECASE)
-        if rating_match:
-            rating_info['min_rating'] = float(rating_match.group(1))
-        
-        rating_match = re.search(r'(?:rating|rated)(?:\s+(?:below|under|less than|lower than))?\s+(\d+(?:\.\d+)?)', query, re.IGNORECASE)
-        if rating_match:
-            rating_info['max_rating'] = float(rating_match.group(1))
+        if hits['digit']:
+            rating_match = _RATING_MIN_RE.search(query)
+            if rating_match:
+                rating_info['min_rating'] = float(rating_match.group(1))
+            
+            rating_match = _RATING_MAX_RE.search(query)
+            if rating_match:
+                rating_info['max_rating'] = float(rating_match.group(1))
         
         # Check for rating keywords
-        if 'best' in query or 'top' in query or 'highest rated' in query or 'excellent' in query:
-            rating_info['rating_level'] = 'high'
-        elif 'worst' in query or 'lowest rated' in query or 'bad' in query or 'terrible' in query:
-            rating_info['rating_level'] = 'low'
+        for level in RATING_LEVEL_KEYWORDS:
+            if hits[('rating_level', level)]:
+                rating_info['rating_level'] = level
+                break
         
         return rating_info if rating_info else None
     
-    def _extract_intent(self, query):
+    def _extract_intent(self, query, hits):
         """
         Extract the main intent of the query.
         
         Args:
             query (str): The user query
+            hits (dict): Keyword matches from _scan
             
         Returns:
             str or None: The main intent or None if unclear
         """
-        # Define intent keywords for restaurants
-        cheap_keywords = ['cheap', 'budget', 'affordable', 'inexpensive', 'economical', 'low price', 'low cost']
-        expensive_keywords = ['expensive', 'luxury', 'premium', 'high-end', 'pricey', 'costly', 'upscale', 'fancy']
-        best_keywords = ['best', 'top', 'highest rated', 'highly rated', 'excellent', '5 star', 'five star', 'top rated']
-        worst_keywords = ['worst', 'lowest rated', 'poorly rated', 'bad', 'terrible', 'avoid']
-        
-        # Define intent keywords for hotels
-        amenities_keywords = ['with pool', 'free wifi', 'gym', 'fitness', 'breakfast included', 'spa', 'parking', 'pet friendly']
-        category_keywords = ['boutique', 'resort', 'motel', 'hostel', 'bed and breakfast', 'family hotel', 'business hotel']
-        
-        # Define intent keywords for vehicles
-        vehicle_type_keywords = ['car', 'truck', 'van', 'bus', 'motorcycle', 'suv', 'cycle', 'bike']
-        capacity_keywords = ['seats', 'passengers', 'people', 'person', 'capacity', 'for 2', 'for 4', 'for 6', 'fit']
+        # Check for intent keywords in query
+        for intent in INTENT_KEYWORDS:
+            if hits[('intent', intent)]:
+                return intent
         
-        # Analyze the query
+        # Analyze the query, only needed when no intent keyword matched
         query_type = None
-        if 'restaurant' in query or 'food' in query or 'place to eat' in query:
-            query_type = 'restaurant'
-        elif 'hotel' in query or 'place to stay' in query or 'accommodation' in query:
-            query_type = 'hotel'
-        elif 'vehicle' in query or 'car' in query or 'rental' in query:
-            query_type = 'vehicle'
-            
-        # Check for intent keywords in query
-        if any(keyword in query for keyword in cheap_keywords):
-            return 'cheap'
-        elif any(keyword in query for keyword in expensive_keywords):
-            return 'expensive'
-        elif any(keyword in query for keyword in best_keywords):
-            return 'best'
-        elif any(keyword in query for keyword in worst_keywords):
-            return 'worst'
+        for topic in INTENT_TOPIC_KEYWORDS:
+            if hits[('intent_topic', topic)]:
+                query_type = topic
+                break
         
         # Check for query type-specific intents
         if query_type == 'restaurant':
             # Check if the query is primarily about a cuisine
-            for cuisine in self.cuisine_types:
-                if cuisine in query:
-                    return 'cuisine'
+            if hits['cuisine']:
+                return 'cuisine'
             
             # Check for location focus
-            if any(keyword in query for keyword in self.location_keywords):
+            if hits['location_keyword']:
                 return 'location'
                 
         elif query_type == 'hotel':
             # Check for amenities focus
-            if any(keyword in query for keyword in amenities_keywords):
+            if hits['amenities_intent']:
                 return 'amenities'
                 
             # Check for category focus
-            if any(keyword in query for keyword in category_keywords):
+            if hits['category_intent']:
                 return 'category'
                 
             # Check for location focus
-            if any(keyword in query for keyword in self.location_keywords):
+            if hits['location_keyword']:
                 return 'location'
                 
         elif query_type == 'vehicle':
             # Check for vehicle type focus
-            if any(keyword in query for keyword in vehicle_type_keywords):
+            if hits['vehicle_type_intent']:
                 return 'type'
                 
             # Check for capacity focus
-            if any(keyword in query for keyword in capacity_keywords):
+            if hits['capacity_intent']:
                 return 'capacity'
                 
             # Check for location focus
-            if any(keyword in query for keyword in self.location_keywords):
+            if hits['location_keyword']:
                 return 'location'
         
         # Check for generic location focus if query type wasn't determined
-        if any(keyword in query for keyword in self.location_keywords) or re.search(r'in\s+(\w+)', query):
+        if hits['location_keyword'] or _IN_WORD_RE.search(query):
             return 'location'
         
         # If we couldn't determine a clear intent, default to a mix of price and quality
         return 'price_quality_mix'
     
-    def _extract_cuisine(self, query):
+    def _extract_cuisine(self, query, hits):
         """
         Extract cuisine preferences from the query.
         
         Args:
             query (str): The user query
+            hits (dict): Keyword matches from _scan
             
         Returns:
             str or None: The cuisine preference or None if not found
         """
-        for cuisine in self.cuisine_types:
-            if cuisine in query:
-                return cuisine
+        if not hits['cuisine']:
+            return None
         
-        return None
+        # Prefer the most specific match ("south indian" over "indian"), then the earliest one
+        return max(hits['cuisine'], key=lambda cuisine: (len(cuisine), -query.find(cuisine)))
     
     def _find_similar_cuisines(self, cuisine):
         """
@@ -534,159 +764,106 @@ class NLPProcessor:
             cuisine (str): The specified cuisine
             
         Returns:
-            list or None: Similar cuisines or None if none found
+            tuple or None: Similar cuisines or None if none found
         """
-        if cuisine in self.cuisine_similarity:
-            return self.cuisine_similarity[cuisine]
-        return None
+        return self.cuisine_similarity.get(cuisine)
     
-    def _extract_hotel_category(self, query):
+    def _extract_hotel_category(self, query, hits):
         """
         Extract hotel category preferences from the query.
         
         Args:
             query (str): The user query
+            hits (dict): Keyword matches from _scan
             
         Returns:
             str or None: The hotel category or None if not found
         """
-        categories = ['luxury', 'budget', 'family', 'business', 'resort', 'friendly']
-        
-        for category in categories:
-            if category in query:
+        for category in HOTEL_CATEGORIES:
+            if category in hits['hotel_category']:
                 return category
         
         return None
     
-    def _extract_amenities(self, query):
+    def _extract_amenities(self, query, hits):
         """
         Extract amenity preferences from the query.
         
         Args:
             query (str): The user query
+            hits (dict): Keyword matches from _scan
             
         Returns:
             list or None: The amenities or None if not found
         """
-        # Common hotel amenities with variations to match the dataset format
-        amenity_mapping = {
-            'wifi': ['wifi', 'wi-fi', 'wi fi', 'wireless', 'internet', 'free wifi', 'free wi-fi'],
-            'pool': ['pool', 'swimming pool', 'rooftop pool', 'outdoor pool', 'indoor pool'],
-            'gym': ['gym', 'fitness center', 'fitness room', 'workout', 'exercise'],
-            'spa': ['spa', 'wellness', 'massage', 'sauna'],
-            'restaurant': ['restaurant', 'dining', 'cafe', 'eatery', 'food', 'fine dining'],
-            'bar': ['bar', 'lounge', 'pub', 'cocktail'],
-            'breakfast': ['breakfast', 'complimentary breakfast', 'free breakfast', 'morning meal'],
-            'parking': ['parking', 'free parking', 'valet', 'car park'],
-            'air conditioning': ['air conditioning', 'ac', 'a/c', 'climate control', 'air-conditioned'],
-            'room service': ['room service', '24-hour service', '24/7 service'],
-            'business': ['business center', 'conference', 'meeting rooms'],
-            'laundry': ['laundry', 'dry cleaning', 'cleaning service']
-        }
-        
-        amenities = []
-        
         # Check for each amenity and its variations
-        for main_amenity, variations in amenity_mapping.items():
-            for variation in variations:
-                if variation in query.lower():
-                    if main_amenity not in amenities:  # Avoid duplicates
-                        amenities.append(main_amenity)
-                    break  # Found one variation, no need to check others
+        amenities = [amenity for amenity in AMENITY_MAPPING if hits[('amenity', amenity)]]
         
         return amenities if amenities else None
     
-    def _extract_vehicle_type(self, query):
+    def _extract_vehicle_type(self, query, hits):
         """
         Extract vehicle type preferences from the query.
         
         Args:
             query (str): The user query
+            hits (dict): Keyword matches from _scan
             
         Returns:
             str or None: The vehicle type or None if not found
         """
-        # Map specific vehicle types to general categories in our database
-        vehicle_type_mapping = {
-            'car': ['car', 'sedan', 'hatchback'],
-            'suv': ['suv', 'jeep', '4x4', 'four wheel drive', '4 wheel drive'],
-            'minivan': ['minivan', 'van', 'mpv', 'family car'],
-            'truck': ['truck', 'pickup', 'lorry'],
-            'luxury car': ['luxury car', 'premium car', 'high end car'],
-            'convertible': ['convertible', 'cabrio', 'cabriolet', 'open top'],
-            'bike': ['bike', 'motorcycle', 'scooter', 'bicycle', 'cycle'],
-            'bus': ['bus', 'coach', 'minibus']
-        }
-        
         # Check for each vehicle type and its variations
-        for main_type, variations in vehicle_type_mapping.items():
-            for variation in variations:
-                if variation in query.lower():
-                    return main_type
+        for main_type in VEHICLE_TYPE_MAPPING:
+            if hits[('vehicle_type', main_type)]:
+                return main_type
                     
         # If specific type not found, check for generic categories
-        generic_types = ['car', 'suv', 'bike', 'motorcycle', 'bus']
-        for vehicle_type in generic_types:
-            if vehicle_type in query:
+        for vehicle_type in GENERIC_VEHICLE_TYPES:
+            if vehicle_type in hits['generic_vehicle_type']:
                 return vehicle_type
         
         return None
     
-    def _extract_passengers(self, query):
+    def _extract_passengers(self, query, hits):
         """
         Extract passenger count from the query.
         
         Args:
             query (str): The user query
+            hits (dict): Keyword matches from _scan
             
         Returns:
             int or None: The passenger count or None if not found
         """
         # Look for various patterns related to passenger counts
-        patterns = [
-            # "for X people/passengers/persons"
-            r'(?:for|with)\s+(\d+)\s+(?:people|person|passenger|passengers|persons)',
-            # "X passenger/person vehicle"
-            r'(\d+)[- ](?:passenger|person|people|seat)',
-            # "seats X people/passengers"
-            r'seats?\s+(\d+)',
-            # "capacity of/for X"
-            r'capacity\s+(?:of|for)?\s+(\d+)',
-            # "fits X people"
-            r'fits?\s+(\d+)',
-            # "that can seat X"
-            r'that\s+can\s+seat\s+(\d+)',
-            # "X seater"
-            r'(\d+)[ -]seater'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                return int(match.group(1))
+        if hits['digit']:
+            for pattern in _PASSENGER_PATTERNS:
+                match = pattern.search(query)
+                if match:
+                    return int(match.group(1))
         
         # Check for common numbers in queries about family vehicles
-        if 'family' in query:
+        if hits['family']:
             return 4  # Default family size
             
-        if 'couple' in query or 'two people' in query:
+        if hits['couple']:
             return 2
             
         return None
     
-    def _extract_vehicle_preference(self, query):
+    def _extract_vehicle_preference(self, query, hits):
         """
         Extract vehicle preference from the query.
         
         Args:
             query (str): The user query
+            hits (dict): Keyword matches from _scan
             
         Returns:
             str or None: The vehicle preference or None if not found
         """
-        if 'luxury' in query or 'premium' in query or 'high-end' in query:
-            return 'luxury'
-        elif 'cheap' in query or 'budget' in query or 'affordable' in query:
-            return 'cheap'
+        for preference in VEHICLE_PREFERENCE_KEYWORDS:
+            if hits[('preference', preference)]:
+                return preference
         
         return None
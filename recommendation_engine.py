@@ -2,15 +2,283 @@
 Module for generating recommendations based on user filters.
 """
 import logging
+import numpy as np
 import pandas as pd
 import re
-from utils import format_restaurant, format_hotel, format_vehicle
+from functools import lru_cache
+from keyword_scanner import KeywordScanner
+from utils import format_restaurant, format_hotel, format_vehicle, format_amenities, extract_colors
 
 logger = logging.getLogger(__name__)
 
+# Characters that make a filter value a regex rather than plain text
+_REGEX_META_RE = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern):
+    """
+    Compile a filter pattern, reusing it across calls.
+    
+    The searched columns are lowercased when loaded, so patterns are built from
+    lowercased filter values and matched case-sensitively.
+    
+    Args:
+        pattern (str): Regex pattern, usually a filter value such as a location
+        
+    Returns:
+        re.Pattern: The compiled pattern
+    """
+    return re.compile(pattern)
+
+def _contains(column, value):
+    """
+    Match a filter value against a lowercased text column.
+    
+    Plain values, which is nearly all of them, use a literal substring search;
+    values with regex metacharacters still go through the regex engine.
+    
+    Args:
+        column (pandas.Series): Lowercased text column to search
+        value (str): The filter value
+        
+    Returns:
+        pandas.Series: Boolean mask of the rows containing the value
+    """
+    value = value.lower()
+    if _REGEX_META_RE.search(value) is None:
+        return column.str.contains(value, regex=False, na=False)
+    if isinstance(column.dtype, pd.StringDtype):
+        # Arrow matches regexes with RE2, so keep Python's re semantics instead
+        column = column.astype(object)
+    return column.str.contains(_compile_pattern(value), na=False)
+
+def _value_score(prices, norm_ratings):
+    """
+    Score rows on value: 70% rating and 30% price, with lower prices scoring higher.
+    
+    The arithmetic runs in place on the one array allocated for the price term,
+    rather than allocating a temporary for every step.
+    
+    Args:
+        prices (numpy.ndarray): Prices of the rows
+        norm_ratings (numpy.ndarray): Ratings of the rows on a 0-1 scale
+        
+    Returns:
+        numpy.ndarray: The value score of each row
+    """
+    # Normalize prices to 0-1 scale (inverted so lower is better)
+    # Missing prices are skipped, as Series.max does, and don't count as a maximum
+    max_price = np.nanmax(prices) if not np.isnan(prices).all() else 0
+    score = np.divide(prices, max_price if max_price > 0 else 1)
+    np.subtract(1, score, out=score)
+    
+    # Combine with the rating for a value score (70% rating, 30% price)
+    np.multiply(score, 0.3, out=score)
+    weighted_ratings = 0.7 * norm_ratings
+    if np.can_cast(score.dtype, weighted_ratings.dtype):
+        return np.add(weighted_ratings, score, out=weighted_ratings)
+    return weighted_ratings + score
+
+def _top_positions(values, n):
+    """
+    Find the positions of the n largest values, largest first.
+    
+    Ties keep their original order and NaNs come last, as with a stable
+    descending sort.
+    
+    Args:
+        values (numpy.ndarray): Values to rank
+        n (int): Number of positions to return
+        
+    Returns:
+        numpy.ndarray: Positions of the top n values in ranked order
+    """
+    keys = -values
+    positions = np.arange(len(keys))
+    if 0 < n < len(keys):
+        cutoff = np.partition(keys, n - 1)[n - 1]
+        if not np.isnan(cutoff):
+            positions = np.flatnonzero(keys <= cutoff)
+    
+    return positions[np.argsort(keys[positions], kind='stable')][:n]
+
+def _top_rows(data, columns, ascending, n):
+    """
+    Return the first n rows of data sorted by columns, without sorting all of it.
+    
+    Only rows that can reach the top n on the first sort column are sorted. Ties
+    keep their original order, as with a stable sort.
+    
+    Args:
+        data (pandas.DataFrame): Rows to select from
+        columns (list): Columns to sort by
+        ascending (list): Sort direction for each column
+        n (int): Number of rows to return
+        
+    Returns:
+        pandas.DataFrame: The top n rows in sorted order
+    """
+    key = data[columns[0]]
+    
+    # With fewer than n values to rank, every row is needed and the NaNs fill the rest
+    if 0 < n < len(data) and key.count() >= n:
+        if ascending[0]:
+            cutoff = key.nsmallest(n).iloc[-1]
+            data = data[(key <= cutoff) | key.isna()]
+        else:
+            cutoff = key.nlargest(n).iloc[-1]
+            data = data[(key >= cutoff) | key.isna()]
+    
+    return data.sort_values(columns, ascending=ascending, kind='stable').head(n)
+
+@lru_cache(maxsize=256)
+def _amenity_scanner(amenities, whole_words):
+    """
+    Build a scanner that finds all the requested amenities in one pass.
+    
+    Args:
+        amenities (tuple): Lowercased amenity names
+        whole_words (bool): Whether amenities only match as whole words
+        
+    Returns:
+        KeywordScanner: The scanner, reused across calls
+    """
+    return KeywordScanner({'amenity': amenities}, whole_words=whole_words)
+
+def _count_amenities(column, amenities, whole_words=True):
+    """
+    Count how many of the requested amenities each value of a column mentions.
+    
+    Args:
+        column (pandas.Series): Lowercased text column to scan
+        amenities (list): Requested amenity names
+        whole_words (bool): Whether amenities only match as whole words
+        
+    Returns:
+        pandas.Series: Number of amenities found in each row
+    """
+    amenities = tuple(amenity.lower() for amenity in amenities)
+    scanner = _amenity_scanner(amenities, whole_words)
+    
+    counts = []
+    for text in column.to_numpy():
+        found = scanner.matches(text)
+        counts.append(sum(amenity in found for amenity in amenities))
+    return pd.Series(counts, index=column.index, dtype=int)
+
+def _index_names(names):
+    """
+    Index the names longer than 3 characters for finding them in a query.
+    
+    Args:
+        names (pandas.Series): Display names, one per row
+        
+    Returns:
+        tuple: A KeywordScanner over the lowercased names and a dictionary
+            mapping each of them to the first row position holding it
+    """
+    first_rows = {}
+    for position, name in enumerate(names.astype(str).str.lower()):
+        if len(name) > 3:
+            first_rows.setdefault(name, position)
+    return KeywordScanner({'name': first_rows}), first_rows
+
+def _find_named_row(name_index, query):
+    """
+    Find the first row whose name occurs in a query.
+    
+    Args:
+        name_index (tuple): Index built by _index_names
+        query (str): The lowercased user query
+        
+    Returns:
+        int or None: Position of the first row named in the query, or None
+    """
+    scanner, first_rows = name_index
+    return min((first_rows[name] for name in scanner.matches(query)), default=None)
+
+def _filters_key(filters):
+    """
+    Build a hashable key for a filters dictionary.
+    
+    Args:
+        filters (dict): Dictionary of filters
+        
+    Returns:
+        tuple or None: Sorted (name, value) pairs with lists as tuples, or None
+            if a value can't be hashed
+    """
+    key = tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in filters.items()
+    ))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
 class RecommendationEngine:
     """Class for generating recommendations based on user filters."""
     
+    # Filter method for each restaurant intent; other intents use price_quality_mix
+    _RESTAURANT_FILTERS = {
+        # Case 1: Cheap Restaurants (price_range_to ≤ X → rating ≥ Y → address → cuisines)
+        'cheap': '_filter_cheap_restaurants',
+        # Case 2: Most Expensive (price_range_from ≥ X → rating ≥ Y → address → cuisines)
+        'expensive': '_filter_expensive_restaurants',
+        # Case 3: Best/Highest-Rated (rating ≥ X → price_range_to ≤ Y → cuisines → address)
+        'best': '_filter_best_restaurants',
+        # Case 4: Worst/Lowest-Rated (rating ≤ X → price_range_from ≥ Y → cuisines → address)
+        'worst': '_filter_worst_restaurants',
+        # Case 5: Location-Based (address → rating ≥ X → price_range_to ≤ Y → cuisines)
+        'location': '_filter_location_restaurants',
+        # Case 6: Cuisine-Based (cuisines → rating ≥ X → price_range_to ≤ Y → address)
+        'cuisine': '_filter_cuisine_restaurants',
+        # Case 7: Price+Quality Mix (rating ≥ X → price_range_to ≤ Y → address → cuisines)
+        'price_quality_mix': '_filter_price_quality_mix_restaurants'
+    }
+    
+    # Filter method for each hotel intent; other intents use price_quality_mix
+    _HOTEL_FILTERS = {
+        # Case 1: Cheapest Hotels (price ≤ X → rating ≥ Y → location → category)
+        'cheap': '_filter_cheap_hotels',
+        # Case 2: Most Expensive Hotel (price = max → rating ≥ Y → location → category)
+        'expensive': '_filter_expensive_hotels',
+        # Case 3: Best-Rated Hotels (rating ≥ X → price ≤ Y → location → category)
+        'best': '_filter_best_hotels',
+        # Case 4: Worst-Rated Hotels (rating ≤ X → price ≤/≥ Y → location → category)
+        'worst': '_filter_worst_hotels',
+        # Case 5: Amenities-Based (amenities → rating ≥ X → price ≤ Y → location)
+        'amenities': '_filter_amenities_hotels',
+        # Case 6: Category/Type-Based (category → rating ≥ X → price ≤ Y → location)
+        'category': '_filter_category_hotels',
+        # Case 7: Location-Based (location → rating ≥ X → price ≤ Y → amenities)
+        'location': '_filter_location_hotels',
+        # Case 8: Price+Quality Mix (rating ≥ X → price ≤ Y → location → amenities)
+        'price_quality_mix': '_filter_price_quality_mix_hotels'
+    }
+    
+    # Filter method for each vehicle intent; other intents use price_quality_mix
+    _VEHICLE_FILTERS = {
+        # Case 1: Cheapest Rentals (pricePerDay ≤ X → type → Ratings → pickupLocation)
+        'cheap': '_filter_cheap_vehicles',
+        # Case 2: Most Expensive Rental (pricePerDay = max → type → Ratings → capacity)
+        'expensive': '_filter_expensive_vehicles',
+        # Case 3: Top-Rated Vehicles (Ratings ≥ X → type → pricePerDay → capacity)
+        'best': '_filter_best_vehicles',
+        # Case 4: Low-Rated Vehicles (Ratings ≤ X → type → pricePerDay → capacity)
+        'worst': '_filter_worst_vehicles',
+        # Case 5: Type-Based (type → pricePerDay → Ratings → pickupLocation)
+        'type': '_filter_type_vehicles',
+        # Case 6: Capacity-Based (Passengers ≥ N → type → pricePerDay → Ratings)
+        'capacity': '_filter_capacity_vehicles',
+        # Case 7: Location-Based (pickupLocation/dropOffLocation → type → pricePerDay → Ratings)
+        'location': '_filter_location_vehicles',
+        # Case 8: Price+Quality Mix (Ratings ≥ X → pricePerDay ≤ Y → type → capacity)
+        'price_quality_mix': '_filter_price_quality_mix_vehicles'
+    }
+    
     def __init__(self, restaurants_data, hotels_data, vehicles_data):
         """
         Initialize the RecommendationEngine class.
@@ -20,11 +288,187 @@ class RecommendationEngine:
             hotels_data (pd.DataFrame): Preprocessed hotel data
             vehicles_data (pd.DataFrame): Preprocessed vehicle data
         """
-        self.restaurants_data = restaurants_data
-        self.hotels_data = hotels_data
-        self.vehicles_data = vehicles_data
+        # Ratings normalized to a 0-1 scale for the price/quality value score, and
+        # vehicle colors extracted once for display
+        self.restaurants_data = restaurants_data.assign(rating_norm=restaurants_data['rating'] / 5)
+        self.vehicles_data = vehicles_data.assign(
+            rating_norm=vehicles_data['Ratings'] / 5,
+            color_info=vehicles_data['model_info'].map(extract_colors)
+        )
+        
+        # DataLoader lowercases the filtered text columns; descriptions keep their case
+        # for display, so they get a lowercased copy for matching. Amenities are
+        # cleaned up for display once here rather than per formatted hotel
+        self.hotels_data = hotels_data.assign(
+            description_lc=hotels_data['description'].astype(str).str.lower(),
+            rating_norm=hotels_data['rating'] / 5,
+            amenities_text=hotels_data['amenities'].map(format_amenities)
+        )
+        
+        # Text columns searched by the filters, with the matching rows of each
+        # column cached per filter value. The free-text columns are searched as
+        # Arrow strings; the others are already categorical
+        self._search_columns = {
+            'address': self.restaurants_data['address'].astype('string[pyarrow]'),
+            'cuisines': self.restaurants_data['cuisines'],
+            'amenities': self.hotels_data['amenities'].astype('string[pyarrow]')
+        }
+        self._search_columns.update(
+            (column, self.hotels_data[column]) for column in ('location', 'category')
+        )
+        self._search_columns.update(
+            (column, self.vehicles_data[column]) for column in ('type', 'pickupLocation', 'dropOffLocation')
+        )
+        self._match_cache = lru_cache(maxsize=1024)(self._find_matching_rows)
+        
+        # Names for the direct name lookups, found in a query with a single scan
+        self._hotel_names = _index_names(self.hotels_data['name'])
+        self._vehicle_names = _index_names(self.vehicles_data['name'])
+        activa_rows = np.flatnonzero(self.vehicles_data['name'].astype(str).str.lower().str.contains('activa', regex=False))
+        self._first_activa = int(activa_rows[0]) if len(activa_rows) else None
+        
+        # Price columns cut by the primary price filters, which always see the full
+        # data, so each column is sorted once and then sliced with searchsorted
+        self._price_columns = {
+            'price_range_to': self.restaurants_data,
+            'price_range_from': self.restaurants_data,
+            'price': self.hotels_data,
+            'pricePerDay': self.vehicles_data
+        }
+        self._order_cache = lru_cache(maxsize=None)(self._find_price_order)
+        
+        # The data never changes after construction, so results only depend on the filters
+        self._result_cache = lru_cache(maxsize=1024)(self._find_recommendations)
+        
         self.suggested_alternatives = []
     
+    def _recommend_cached(self, recommend, filters, max_results):
+        """
+        Run a recommendation, reusing the result of an earlier call with the same filters.
+        
+        Args:
+            recommend (callable): The uncached recommendation method
+            filters (dict): Dictionary of filters
+            max_results (int): Maximum number of results to return
+            
+        Returns:
+            list: List of formatted recommendations
+        """
+        filters_key = _filters_key(filters)
+        if filters_key is None:
+            return recommend(filters, max_results)
+        
+        results, alternatives = self._result_cache(recommend, filters_key, max_results)
+        self.suggested_alternatives = list(alternatives)
+        return list(results)
+    
+    def _find_recommendations(self, recommend, filters_key, max_results):
+        """
+        Run a recommendation for the result cache.
+        
+        Args:
+            recommend (callable): The uncached recommendation method
+            filters_key (tuple): Filters as built by _filters_key
+            max_results (int): Maximum number of results to return
+            
+        Returns:
+            tuple: The formatted recommendations and the suggested alternatives
+        """
+        results = recommend(dict(filters_key), max_results)
+        return tuple(results), tuple(self.suggested_alternatives)
+    
+    def _find_matching_rows(self, column, value):
+        """
+        Match a filter value against the full searched column.
+        
+        Args:
+            column (str): Name of the searched column
+            value (str): The lowercased filter value
+            
+        Returns:
+            numpy.ndarray: Boolean mask over every row of the column
+        """
+        return _contains(self._search_columns[column], value).to_numpy(dtype=bool)
+    
+    def _matching_rows(self, data, column, value):
+        """
+        Find the rows of a filtered frame whose column contains a filter value.
+        
+        Args:
+            data (pd.DataFrame): Rows taken from one of the engine's data frames
+            column (str): Name of the searched column
+            value (str): The filter value
+            
+        Returns:
+            numpy.ndarray: Boolean mask over the rows of data
+        """
+        matches = self._match_cache(column, value.lower())
+        return matches[self._search_columns[column].index.get_indexer(data.index)]
+    
+    def _find_price_order(self, column, ascending):
+        """
+        Sort the full data by a price column.
+        
+        Args:
+            column (str): Name of the price column
+            ascending (bool): Sort direction
+            
+        Returns:
+            tuple: Row positions in sorted order and the sorted prices
+        """
+        frame = self._price_columns[column]
+        order = frame.index.get_indexer(frame.sort_values(column, ascending=ascending).index)
+        return order, frame[column].to_numpy()[order]
+    
+    def _price_share(self, data, column, ascending, share=0.3):
+        """
+        Take the cheapest or most expensive share of the rows.
+        
+        Args:
+            data (pd.DataFrame): Rows to cut
+            column (str): Name of the price column
+            ascending (bool): True for the cheapest rows, False for the most expensive
+            share (float): Fraction of the rows to keep
+            
+        Returns:
+            pd.DataFrame: The kept rows, sorted by price
+        """
+        count = int(len(data) * share)
+        if data is not self._price_columns[column]:
+            return data.sort_values(column, ascending=ascending).head(count)
+        
+        order, _ = self._order_cache(column, ascending)
+        return data.iloc[order[:count]]
+    
+    def _price_range_mask(self, data, column, max_price=None, min_price=None):
+        """
+        Select the rows priced at most max_price or at least min_price.
+        
+        Args:
+            data (pd.DataFrame): Rows to select from
+            column (str): Name of the price column
+            max_price (float): Upper bound, if given
+            min_price (float): Lower bound, used when there is no upper bound
+            
+        Returns:
+            numpy.ndarray: Boolean mask over the rows of data
+        """
+        if data is not self._price_columns[column]:
+            if max_price is not None:
+                return data[column].to_numpy() <= max_price
+            return data[column].to_numpy() >= min_price
+        
+        order, prices = self._order_cache(column, True)
+        if max_price is not None:
+            rows = order[:np.searchsorted(prices, max_price, side='right')]
+        else:
+            # Missing prices sort last and never pass the bound
+            rows = order[np.searchsorted(prices, min_price, side='left'):np.searchsorted(prices, np.inf, side='right')]
+        
+        mask = np.zeros(len(data), dtype=bool)
+        mask[rows] = True
+        return mask
+    
     def recommend_restaurants(self, filters, max_results=5):
         """
         Generate restaurant recommendations based on filters.
@@ -36,52 +480,30 @@ class RecommendationEngine:
         Returns:
             list: List of formatted restaurant recommendations
         """
+        return self._recommend_cached(self._recommend_restaurants, filters, max_results)
+    
+    def _recommend_restaurants(self, filters, max_results):
+        """Run the restaurant filters and sort without consulting the result cache."""
         try:
             logger.info(f"Generating restaurant recommendations with filters: {filters}")
             self.suggested_alternatives = []  # Reset suggested alternatives
             
-            # Get a copy of the data to filter
-            filtered_data = self.restaurants_data.copy()
+            # Filtering and sorting return new frames, so the shared data is never modified
+            filtered_data = self.restaurants_data
             
             # Determine the filtering strategy based on intent
             intent = filters.get('intent', 'price_quality_mix')
             
             # Apply filters based on the intent
-            if intent == 'cheap':
-                # Case 1: Cheap Restaurants (price_range_to ≤ X → rating ≥ Y → address → cuisines)
-                filtered_data = self._filter_cheap_restaurants(filtered_data, filters)
-            
-            elif intent == 'expensive':
-                # Case 2: Most Expensive (price_range_from ≥ X → rating ≥ Y → address → cuisines)
-                filtered_data = self._filter_expensive_restaurants(filtered_data, filters)
-            
-            elif intent == 'best':
-                # Case 3: Best/Highest-Rated (rating ≥ X → price_range_to ≤ Y → cuisines → address)
-                filtered_data = self._filter_best_restaurants(filtered_data, filters)
-            
-            elif intent == 'worst':
-                # Case 4: Worst/Lowest-Rated (rating ≤ X → price_range_from ≥ Y → cuisines → address)
-                filtered_data = self._filter_worst_restaurants(filtered_data, filters)
-            
-            elif intent == 'location':
-                # Case 5: Location-Based (address → rating ≥ X → price_range_to ≤ Y → cuisines)
-                filtered_data = self._filter_location_restaurants(filtered_data, filters)
-            
-            elif intent == 'cuisine':
-                # Case 6: Cuisine-Based (cuisines → rating ≥ X → price_range_to ≤ Y → address)
-                filtered_data = self._filter_cuisine_restaurants(filtered_data, filters)
-            
-            else:  # price_quality_mix
-                # Case 7: Price+Quality Mix (rating ≥ X → price_range_to ≤ Y → address → cuisines)
-                filtered_data = self._filter_price_quality_mix_restaurants(filtered_data, filters)
+            filter_method = getattr(self, self._RESTAURANT_FILTERS.get(intent, '_filter_price_quality_mix_restaurants'))
+            filtered_data = filter_method(filtered_data, filters)
             
             # Sort results based on the intent
-            filtered_data = self._sort_restaurants_by_intent(filtered_data, intent)
+            filtered_data = self._sort_restaurants_by_intent(filtered_data, intent, max_results)
             
             # Format results for display
-            results = []
-            for _, row in filtered_data.head(max_results).iterrows():
-                results.append(format_restaurant(row))
+            records = filtered_data.head(max_results).to_dict('records')
+            results = [format_restaurant(record) for record in records]
             
             # Add similar cuisine suggestions if applicable
             if 'cuisine' in filters and 'similar_cuisines' in filters:
@@ -96,34 +518,55 @@ class RecommendationEngine:
             logger.error(f"Error generating restaurant recommendations: {str(e)}")
             return []
     
+    def _apply_restaurant_filters(self, data, filters, steps, mask=None):
+        """
+        Apply the optional restaurant filters in priority order.
+        
+        Args:
+            data (pd.DataFrame): Restaurants to filter
+            filters (dict): Dictionary of filters
+            steps (tuple): Filters to apply in order, from 'min_rating', 'max_price',
+                'min_price', 'location' and 'cuisine'
+            mask (numpy.ndarray): Rows already selected by the intent's primary filter, if any
+            
+        Returns:
+            pd.DataFrame: The restaurants passing every step whose filter is set
+        """
+        # Combine the steps into one mask so the rows are only selected once
+        if mask is None:
+            mask = np.ones(len(data), dtype=bool)
+        for step in steps:
+            if step not in filters:
+                continue
+            
+            if step == 'min_rating':
+                mask &= data['rating'].to_numpy() >= filters['min_rating']
+            elif step == 'max_price':
+                mask &= data['price_range_to'].to_numpy() <= filters['max_price']
+            elif step == 'min_price':
+                mask &= data['price_range_from'].to_numpy() >= filters['min_price']
+            elif step == 'location':
+                mask &= self._matching_rows(data, 'address', filters['location'])
+            elif step == 'cuisine':
+                mask &= self._matching_rows(data, 'cuisines', filters['cuisine'])
+        
+        return data[mask]
+    
     def _filter_cheap_restaurants(self, data, filters):
         """
         Filter for cheap restaurants.
         Priority: price_range_to ≤ X → rating ≥ Y → address → cuisines
         """
         # 1. Filter by price (primary)
+        mask = None
         if 'max_price' in filters:
-            data = data[data['price_range_to'] <= filters['max_price']]
+            mask = self._price_range_mask(data, 'price_range_to', max_price=filters['max_price'])
         elif 'price_level' in filters and filters['price_level'] == 'cheap':
             # Use a reasonable default for "cheap" if no specific price given
-            data = data.sort_values('price_range_to')
-            data = data.head(int(len(data) * 0.3))  # Top 30% cheapest
-        
-        # 2. Filter by rating (secondary)
-        if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
+            data = self._price_share(data, 'price_range_to', ascending=True)  # Top 30% cheapest
         
-        # 3. Filter by location (tertiary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['address'].apply(lambda x: bool(location_pattern.search(x)))]
-        
-        # 4. Filter by cuisine (quaternary)
-        if 'cuisine' in filters:
-            cuisine_pattern = re.compile(filters['cuisine'], re.IGNORECASE)
-            data = data[data['cuisines'].apply(lambda x: bool(cuisine_pattern.search(str(x))))]
-        
-        return data
+        # 2-4. Filter by rating, location and cuisine
+        return self._apply_restaurant_filters(data, filters, ('min_rating', 'location', 'cuisine'), mask)
     
     def _filter_expensive_restaurants(self, data, filters):
         """
@@ -131,28 +574,15 @@ class RecommendationEngine:
         Priority: price_range_from ≥ X → rating ≥ Y → address → cuisines
         """
         # 1. Filter by price (primary)
+        mask = None
         if 'min_price' in filters:
-            data = data[data['price_range_from'] >= filters['min_price']]
+            mask = self._price_range_mask(data, 'price_range_from', min_price=filters['min_price'])
         elif 'price_level' in filters and filters['price_level'] == 'expensive':
             # Use a reasonable default for "expensive" if no specific price given
-            data = data.sort_values('price_range_from', ascending=False)
-            data = data.head(int(len(data) * 0.3))  # Top 30% most expensive
+            data = self._price_share(data, 'price_range_from', ascending=False)  # Top 30% most expensive
         
-        # 2. Filter by rating (secondary)
-        if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
-        
-        # 3. Filter by location (tertiary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['address'].apply(lambda x: bool(location_pattern.search(x)))]
-        
-        # 4. Filter by cuisine (quaternary)
-        if 'cuisine' in filters:
-            cuisine_pattern = re.compile(filters['cuisine'], re.IGNORECASE)
-            data = data[data['cuisines'].apply(lambda x: bool(cuisine_pattern.search(str(x))))]
-        
-        return data
+        # 2-4. Filter by rating, location and cuisine
+        return self._apply_restaurant_filters(data, filters, ('min_rating', 'location', 'cuisine'), mask)
     
     def _filter_best_restaurants(self, data, filters):
         """
@@ -161,26 +591,13 @@ class RecommendationEngine:
         """
         # 1. Filter by rating (primary)
         if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
+            mask = data['rating'].to_numpy() >= filters['min_rating']
         else:
             # Default to 4.0+ rating for "best" if not specified
-            data = data[data['rating'] >= 4.0]
-        
-        # 2. Filter by price (secondary, optional)
-        if 'max_price' in filters:
-            data = data[data['price_range_to'] <= filters['max_price']]
-        
-        # 3. Filter by cuisine (tertiary)
-        if 'cuisine' in filters:
-            cuisine_pattern = re.compile(filters['cuisine'], re.IGNORECASE)
-            data = data[data['cuisines'].apply(lambda x: bool(cuisine_pattern.search(str(x))))]
-        
-        # 4. Filter by location (quaternary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['address'].apply(lambda x: bool(location_pattern.search(x)))]
+            mask = data['rating'].to_numpy() >= 4.0
         
-        return data
+        # 2-4. Filter by price, cuisine and location
+        return self._apply_restaurant_filters(data, filters, ('max_price', 'cuisine', 'location'), mask)
     
     def _filter_worst_restaurants(self, data, filters):
         """
@@ -189,76 +606,27 @@ class RecommendationEngine:
         """
         # 1. Filter by rating (primary)
         if 'max_rating' in filters:
-            data = data[data['rating'] <= filters['max_rating']]
+            mask = data['rating'].to_numpy() <= filters['max_rating']
         else:
             # Default to 3.0- rating for "worst" if not specified
-            data = data[data['rating'] <= 3.0]
-        
-        # 2. Filter by price (secondary, optional)
-        if 'min_price' in filters:
-            data = data[data['price_range_from'] >= filters['min_price']]
+            mask = data['rating'].to_numpy() <= 3.0
         
-        # 3. Filter by cuisine (tertiary)
-        if 'cuisine' in filters:
-            cuisine_pattern = re.compile(filters['cuisine'], re.IGNORECASE)
-            data = data[data['cuisines'].apply(lambda x: bool(cuisine_pattern.search(str(x))))]
-        
-        # 4. Filter by location (quaternary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['address'].apply(lambda x: bool(location_pattern.search(x)))]
-        
-        return data
+        # 2-4. Filter by price, cuisine and location
+        return self._apply_restaurant_filters(data, filters, ('min_price', 'cuisine', 'location'), mask)
     
     def _filter_location_restaurants(self, data, filters):
         """
         Filter for location-based restaurants.
         Priority: address → rating ≥ X → price_range_to ≤ Y → cuisines
         """
-        # 1. Filter by location (primary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['address'].apply(lambda x: bool(location_pattern.search(x)))]
-        
-        # 2. Filter by rating (secondary)
-        if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
-        
-        # 3. Filter by price (tertiary)
-        if 'max_price' in filters:
-            data = data[data['price_range_to'] <= filters['max_price']]
-        
-        # 4. Filter by cuisine (quaternary)
-        if 'cuisine' in filters:
-            cuisine_pattern = re.compile(filters['cuisine'], re.IGNORECASE)
-            data = data[data['cuisines'].apply(lambda x: bool(cuisine_pattern.search(str(x))))]
-        
-        return data
+        return self._apply_restaurant_filters(data, filters, ('location', 'min_rating', 'max_price', 'cuisine'))
     
     def _filter_cuisine_restaurants(self, data, filters):
         """
         Filter for cuisine-based restaurants.
         Priority: cuisines → rating ≥ X → price_range_to ≤ Y → address
         """
-        # 1. Filter by cuisine (primary)
-        if 'cuisine' in filters:
-            cuisine_pattern = re.compile(filters['cuisine'], re.IGNORECASE)
-            data = data[data['cuisines'].apply(lambda x: bool(cuisine_pattern.search(str(x))))]
-        
-        # 2. Filter by rating (secondary)
-        if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
-        
-        # 3. Filter by price (tertiary)
-        if 'max_price' in filters:
-            data = data[data['price_range_to'] <= filters['max_price']]
-        
-        # 4. Filter by location (quaternary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['address'].apply(lambda x: bool(location_pattern.search(x)))]
-        
-        return data
+        return self._apply_restaurant_filters(data, filters, ('cuisine', 'min_rating', 'max_price', 'location'))
     
     def _filter_price_quality_mix_restaurants(self, data, filters):
         """
@@ -267,65 +635,47 @@ class RecommendationEngine:
         """
         # 1. Filter by rating (primary)
         if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
+            mask = data['rating'].to_numpy() >= filters['min_rating']
         else:
             # Default to 3.5+ rating for "quality" if not specified
-            data = data[data['rating'] >= 3.5]
-        
-        # 2. Filter by price (secondary)
-        if 'max_price' in filters:
-            data = data[data['price_range_to'] <= filters['max_price']]
+            mask = data['rating'].to_numpy() >= 3.5
         
-        # 3. Filter by location (tertiary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['address'].apply(lambda x: bool(location_pattern.search(x)))]
-        
-        # 4. Filter by cuisine (quaternary)
-        if 'cuisine' in filters:
-            cuisine_pattern = re.compile(filters['cuisine'], re.IGNORECASE)
-            data = data[data['cuisines'].apply(lambda x: bool(cuisine_pattern.search(str(x))))]
-        
-        return data
+        # 2-4. Filter by price, location and cuisine
+        return self._apply_restaurant_filters(data, filters, ('max_price', 'location', 'cuisine'), mask)
     
-    def _sort_restaurants_by_intent(self, data, intent):
-        """Sort filtered restaurants based on the intent."""
+    def _sort_restaurants_by_intent(self, data, intent, max_results):
+        """Select the top max_results filtered restaurants based on the intent."""
         if not data.empty:
             if intent == 'cheap':
                 # Sort by price (ascending), then rating (descending)
-                return data.sort_values(['price_range_to', 'rating'], ascending=[True, False])
+                return _top_rows(data, ['price_range_to', 'rating'], [True, False], max_results)
             
             elif intent == 'expensive':
                 # Sort by price (descending), then rating (descending)
-                return data.sort_values(['price_range_from', 'rating'], ascending=[False, False])
+                return _top_rows(data, ['price_range_from', 'rating'], [False, False], max_results)
             
             elif intent == 'best':
                 # Sort by rating (descending), then review count (descending)
-                return data.sort_values(['rating', 'review_count'], ascending=[False, False])
+                return _top_rows(data, ['rating', 'review_count'], [False, False], max_results)
             
             elif intent == 'worst':
                 # Sort by rating (ascending), then price (descending)
-                return data.sort_values(['rating', 'price_range_from'], ascending=[True, False])
+                return _top_rows(data, ['rating', 'price_range_from'], [True, False], max_results)
             
             elif intent == 'location' or intent == 'cuisine':
                 # Sort by rating (descending), then price (ascending)
-                return data.sort_values(['rating', 'price_range_to'], ascending=[False, True])
+                return _top_rows(data, ['rating', 'price_range_to'], [False, True], max_results)
             
             else:  # price_quality_mix
                 # Calculate a score based on rating and price
-                if 'score' not in data.columns:
-                    # Normalize price_range_to to 0-1 scale (inverted so lower is better)
-                    max_price = data['price_range_to'].max() if data['price_range_to'].max() > 0 else 1
-                    norm_price = 1 - (data['price_range_to'] / max_price)
-                    
-                    # Normalize rating to 0-1 scale
-                    norm_rating = data['rating'] / 5
-                    
-                    # Combine for a value score (70% rating, 30% price)
-                    data['score'] = (0.7 * norm_rating) + (0.3 * norm_price)
+                if 'score' in data.columns:
+                    score = data['score'].to_numpy()
+                else:
+                    score = _value_score(data['price_range_to'].to_numpy(), data['rating_norm'].to_numpy())
                 
-                # Sort by the computed score (descending)
-                return data.sort_values('score', ascending=False)
+                # Select the best scores (descending), attaching the score to those rows only
+                top = _top_positions(score, max_results)
+                return data.iloc[top].assign(score=score[top])
         
         return data
     
@@ -340,6 +690,10 @@ class RecommendationEngine:
         Returns:
             list: List of formatted hotel recommendations
         """
+        return self._recommend_cached(self._recommend_hotels, filters, max_results)
+    
+    def _recommend_hotels(self, filters, max_results):
+        """Run the hotel filters and sort without consulting the result cache."""
         try:
             logger.info(f"Generating hotel recommendations with filters: {filters}")
             self.suggested_alternatives = []  # Reset suggested alternatives
@@ -348,62 +702,30 @@ class RecommendationEngine:
             original_query = filters.get('query', '').lower()
             
             # First try to find exact hotel name matches in the query
-            for _, hotel in self.hotels_data.iterrows():
-                hotel_name = str(hotel.get('name', '')).lower()
-                if hotel_name and len(hotel_name) > 3 and hotel_name in original_query:
-                    logger.info(f"Found hotel name in query: {hotel_name}")
-                    hotel_row = self.hotels_data[self.hotels_data['name'].str.lower() == hotel_name]
-                    if not hotel_row.empty:
-                        # Return the specific hotel
-                        logger.info(f"Returning specific hotel by name: {hotel_name}")
-                        return [format_hotel(hotel_row.iloc[0])]
+            position = _find_named_row(self._hotel_names, original_query)
+            if position is not None:
+                hotel = self.hotels_data.iloc[[position]].to_dict('records')[0]
+                logger.info(f"Found hotel name in query: {str(hotel['name']).lower()}")
+                
+                # Return the specific hotel
+                return [format_hotel(hotel)]
             
-            # Get a copy of the data to filter
-            filtered_data = self.hotels_data.copy()
+            # Filtering and sorting return new frames, so the shared data is never modified
+            filtered_data = self.hotels_data
             
             # Determine the filtering strategy based on intent
             intent = filters.get('intent', 'price_quality_mix')
             
             # Apply filters based on the intent
-            if intent == 'cheap':
-                # Case 1: Cheapest Hotels (price ≤ X → rating ≥ Y → location → category)
-                filtered_data = self._filter_cheap_hotels(filtered_data, filters)
-            
-            elif intent == 'expensive':
-                # Case 2: Most Expensive Hotel (price = max → rating ≥ Y → location → category)
-                filtered_data = self._filter_expensive_hotels(filtered_data, filters)
-            
-            elif intent == 'best':
-                # Case 3: Best-Rated Hotels (rating ≥ X → price ≤ Y → location → category)
-                filtered_data = self._filter_best_hotels(filtered_data, filters)
-            
-            elif intent == 'worst':
-                # Case 4: Worst-Rated Hotels (rating ≤ X → price ≤/≥ Y → location → category)
-                filtered_data = self._filter_worst_hotels(filtered_data, filters)
-            
-            elif intent == 'amenities':
-                # Case 5: Amenities-Based (amenities → rating ≥ X → price ≤ Y → location)
-                filtered_data = self._filter_amenities_hotels(filtered_data, filters)
-            
-            elif intent == 'category':
-                # Case 6: Category/Type-Based (category → rating ≥ X → price ≤ Y → location)
-                filtered_data = self._filter_category_hotels(filtered_data, filters)
-            
-            elif intent == 'location':
-                # Case 7: Location-Based (location → rating ≥ X → price ≤ Y → amenities)
-                filtered_data = self._filter_location_hotels(filtered_data, filters)
-            
-            else:  # price_quality_mix
-                # Case 8: Price+Quality Mix (rating ≥ X → price ≤ Y → location → amenities)
-                filtered_data = self._filter_price_quality_mix_hotels(filtered_data, filters)
+            filter_method = getattr(self, self._HOTEL_FILTERS.get(intent, '_filter_price_quality_mix_hotels'))
+            filtered_data = filter_method(filtered_data, filters)
             
             # Sort results based on the intent
-            filtered_data = self._sort_hotels_by_intent(filtered_data, intent)
+            filtered_data = self._sort_hotels_by_intent(filtered_data, intent, max_results)
             
             # Format results for display
-            results = []
-            for _, row in filtered_data.head(max_results).iterrows():
-                results.append(format_hotel(row))
+            records = filtered_data.head(max_results).to_dict('records')
+            results = [format_hotel(record) for record in records]
             
             logger.info(f"Found {len(results)} hotel recommendations")
             return results
@@ -412,36 +734,60 @@ class RecommendationEngine:
             logger.error(f"Error generating hotel recommendations: {str(e)}")
             return []
             
+    def _apply_hotel_filters(self, data, filters, steps, mask=None):
+        """
+        Apply the optional hotel filters in priority order.
+        
+        Args:
+            data (pd.DataFrame): Hotels to filter
+            filters (dict): Dictionary of filters
+            steps (tuple): Filters to apply in order, from 'min_rating', 'max_price',
+                'location', 'category' and 'amenities'
+            mask (numpy.ndarray): Rows already selected by the intent's primary filter, if any
+            
+        Returns:
+            pd.DataFrame: The hotels passing every step whose filter is set
+        """
+        # Combine the steps into one mask so the rows are only selected once
+        if mask is None:
+            mask = np.ones(len(data), dtype=bool)
+        for step in steps:
+            if step == 'min_rating':
+                if 'min_rating' in filters:
+                    mask &= data['rating'].to_numpy() >= filters['min_rating']
+                elif 'rating_level' in filters and filters['rating_level'] == 'high':
+                    mask &= data['rating'].to_numpy() >= 4.0
+            elif step == 'max_price':
+                if 'max_price' in filters:
+                    mask &= data['price'].to_numpy() <= filters['max_price']
+            elif step == 'location':
+                if 'location' in filters:
+                    mask &= self._matching_rows(data, 'location', filters['location'])
+            elif step == 'category':
+                if 'category' in filters:
+                    mask &= self._matching_rows(data, 'category', filters['category'])
+            elif step == 'amenities':
+                if 'amenities' in filters and filters['amenities']:
+                    for amenity in filters['amenities']:
+                        mask &= self._matching_rows(data, 'amenities', amenity)
+        
+        return data[mask]
+    
     def _filter_cheap_hotels(self, data, filters):
         """
         Filter for cheap hotels.
         Priority: price ≤ X → rating ≥ Y → location → category
         """
         # 1. Filter by price (primary)
+        mask = None
         if 'max_price' in filters:
-            data = data[data['price'] <= filters['max_price']]
+            mask = self._price_range_mask(data, 'price', max_price=filters['max_price'])
         elif 'price_level' in filters and filters['price_level'] == 'cheap':
             # Use a reasonable default for "cheap" if no specific price given
-            data = data.sort_values('price')
-            data = data.head(int(len(data) * 0.3))  # Top 30% cheapest
-        
-        # 2. Filter by rating (secondary)
-        if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
-        elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['rating'] >= 4.0]
-        
-        # 3. Filter by location (tertiary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['location'].apply(lambda x: bool(location_pattern.search(str(x))))]
+            data = self._price_share(data, 'price', ascending=True)  # Top 30% cheapest
         
-        # 4. Filter by category (quaternary)
-        if 'category' in filters:
-            category_pattern = re.compile(filters['category'], re.IGNORECASE)
-            data = data[data['category'].apply(lambda x: bool(category_pattern.search(str(x))))]
-        
-        return data
+        # 2-4. Filter by rating, location and category
+        return self._apply_hotel_filters(data, filters, ('min_rating', 'location', 'category'), mask)
     
     def _filter_expensive_hotels(self, data, filters):
         """
@@ -449,30 +795,15 @@ class RecommendationEngine:
         Priority: price = max → rating ≥ Y → location → category
         """
         # 1. Filter by price (primary)
+        mask = None
         if 'min_price' in filters:
-            data = data[data['price'] >= filters['min_price']]
+            mask = self._price_range_mask(data, 'price', min_price=filters['min_price'])
         elif 'price_level' in filters and filters['price_level'] == 'expensive':
             # Use a reasonable default for "expensive" if no specific price given
-            data = data.sort_values('price', ascending=False)
-            data = data.head(int(len(data) * 0.3))  # Top 30% most expensive
-        
-        # 2. Filter by rating (secondary)
-        if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
-        elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['rating'] >= 4.0]
+            data = self._price_share(data, 'price', ascending=False)  # Top 30% most expensive
         
-        # 3. Filter by location (tertiary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['location'].apply(lambda x: bool(location_pattern.search(str(x))))]
-        
-        # 4. Filter by category (quaternary)
-        if 'category' in filters:
-            category_pattern = re.compile(filters['category'], re.IGNORECASE)
-            data = data[data['category'].apply(lambda x: bool(category_pattern.search(str(x))))]
-        
-        return data
+        # 2-4. Filter by rating, location and category
+        return self._apply_hotel_filters(data, filters, ('min_rating', 'location', 'category'), mask)
     
     def _filter_best_hotels(self, data, filters):
         """
@@ -481,28 +812,15 @@ class RecommendationEngine:
         """
         # 1. Filter by rating (primary)
         if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
+            mask = data['rating'].to_numpy() >= filters['min_rating']
         elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['rating'] >= 4.0]
+            mask = data['rating'].to_numpy() >= 4.0
         else:
             # Default to 4.0+ rating for "best" if not specified
-            data = data[data['rating'] >= 4.0]
+            mask = data['rating'].to_numpy() >= 4.0
         
-        # 2. Filter by price (secondary, optional)
-        if 'max_price' in filters:
-            data = data[data['price'] <= filters['max_price']]
-        
-        # 3. Filter by location (tertiary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['location'].apply(lambda x: bool(location_pattern.search(str(x))))]
-        
-        # 4. Filter by category (quaternary)
-        if 'category' in filters:
-            category_pattern = re.compile(filters['category'], re.IGNORECASE)
-            data = data[data['category'].apply(lambda x: bool(category_pattern.search(str(x))))]
-        
-        return data
+        # 2-4. Filter by price, location and category
+        return self._apply_hotel_filters(data, filters, ('max_price', 'location', 'category'), mask)
     
     def _filter_worst_hotels(self, data, filters):
         """
@@ -511,84 +829,55 @@ class RecommendationEngine:
         """
         # 1. Filter by rating (primary)
         if 'max_rating' in filters:
-            data = data[data['rating'] <= filters['max_rating']]
+            mask = data['rating'].to_numpy() <= filters['max_rating']
         elif 'rating_level' in filters and filters['rating_level'] == 'low':
-            data = data[data['rating'] <= 3.0]
+            mask = data['rating'].to_numpy() <= 3.0
         else:
             # Default to 3.0- rating for "worst" if not specified
-            data = data[data['rating'] <= 3.0]
+            mask = data['rating'].to_numpy() <= 3.0
         
         # 2. Filter by price (secondary, optional)
         if 'min_price' in filters:
-            data = data[data['price'] >= filters['min_price']]
+            mask &= data['price'].to_numpy() >= filters['min_price']
         elif 'max_price' in filters:
-            data = data[data['price'] <= filters['max_price']]
-        
-        # 3. Filter by location (tertiary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['location'].apply(lambda x: bool(location_pattern.search(str(x))))]
+            mask &= data['price'].to_numpy() <= filters['max_price']
         
-        # 4. Filter by category (quaternary)
-        if 'category' in filters:
-            category_pattern = re.compile(filters['category'], re.IGNORECASE)
-            data = data[data['category'].apply(lambda x: bool(category_pattern.search(str(x))))]
-        
-        return data
+        # 3-4. Filter by location and category
+        return self._apply_hotel_filters(data, filters, ('location', 'category'), mask)
     
     def _filter_amenities_hotels(self, data, filters):
         """
         Filter for amenities-based hotels.
         Priority: amenities → rating ≥ X → price ≤ Y → location
         """
-        # Make a copy of the original data in case we don't find matches
-        original_data = data.copy()
-        filtered_data = original_data.copy()
+        # Keep the original data in case we don't find matches
+        original_data = data
+        
+        # Apply the cheap numeric filters first so only their survivors get scored
+        # 2-3. Filter by rating and price
+        filtered_data = self._apply_hotel_filters(data, filters, ('min_rating', 'max_price'))
         
         # Create a scoring system instead of strict filtering
         if 'amenities' in filters and filters['amenities']:
-            # Initialize a score column
-            filtered_data['amenity_score'] = 0
-            
-            # Score each hotel based on how many requested amenities it has
-            for amenity in filters['amenities']:
-                # Create patterns for this amenity with variations
-                amenity_pattern = re.compile(r'\b' + re.escape(amenity) + r'\b', re.IGNORECASE)
-                
-                # Look in amenities field
-                filtered_data['amenity_score'] += filtered_data['amenities'].apply(
-                    lambda x: 1 if amenity_pattern.search(str(x)) else 0
-                )
-                
-                # Also check description for amenities
-                filtered_data['amenity_score'] += filtered_data['description'].apply(
-                    lambda x: 0.5 if amenity_pattern.search(str(x)) else 0
-                )
+            # Score each hotel based on how many requested amenities it has, with
+            # mentions in the description counting half
+            amenity_score = (
+                _count_amenities(filtered_data['amenities'], filters['amenities'])
+                + _count_amenities(filtered_data['description_lc'], filters['amenities']) * 0.5
+            )
             
             # Filter to include only hotels with at least one matching amenity
+            filtered_data = filtered_data.assign(amenity_score=amenity_score)
             filtered_data = filtered_data[filtered_data['amenity_score'] > 0]
             
             # Sort by amenity score (highest first)
             filtered_data = filtered_data.sort_values('amenity_score', ascending=False)
         
-        # If we have results, apply secondary filters
+        # If we have results, apply the location filter
         if not filtered_data.empty:
-            # 2. Filter by rating (secondary)
-            if 'min_rating' in filters:
-                filtered_data = filtered_data[filtered_data['rating'] >= filters['min_rating']]
-            elif 'rating_level' in filters and filters['rating_level'] == 'high':
-                filtered_data = filtered_data[filtered_data['rating'] >= 4.0]
-            
-            # 3. Filter by price (tertiary)
-            if 'max_price' in filters:
-                filtered_data = filtered_data[filtered_data['price'] <= filters['max_price']]
-            
             # 4. Filter by location (quaternary)
             if 'location' in filters:
-                location_pattern = re.compile(filters['location'], re.IGNORECASE)
-                location_filtered = filtered_data[filtered_data['location'].apply(
-                    lambda x: bool(location_pattern.search(str(x)))
-                )]
+                location_filtered = filtered_data[self._matching_rows(filtered_data, 'location', filters['location'])]
                 
                 # Only apply location filter if it doesn't empty the results
                 if not location_filtered.empty:
@@ -597,14 +886,8 @@ class RecommendationEngine:
         # If still no results, try a more relaxed approach focusing on description
         if filtered_data.empty and 'amenities' in filters and filters['amenities']:
             # Try with a broader search in the description
-            filtered_data = original_data.copy()
-            filtered_data['amenity_score'] = 0
-            
-            for amenity in filters['amenities']:
-                # Search more broadly in the description
-                filtered_data['amenity_score'] += filtered_data['description'].apply(
-                    lambda x: 1 if amenity.lower() in str(x).lower() else 0
-                )
+            amenity_score = _count_amenities(original_data['description_lc'], filters['amenities'], whole_words=False)
+            filtered_data = original_data.assign(amenity_score=amenity_score)
             
             # Filter to hotels with at least one amenity mention
             filtered_data = filtered_data[filtered_data['amenity_score'] > 0]
@@ -617,55 +900,14 @@ class RecommendationEngine:
         Filter for category/type-based hotels.
         Priority: category → rating ≥ X → price ≤ Y → location
         """
-        # 1. Filter by category (primary)
-        if 'category' in filters:
-            category_pattern = re.compile(filters['category'], re.IGNORECASE)
-            data = data[data['category'].apply(lambda x: bool(category_pattern.search(str(x))))]
-        
-        # 2. Filter by rating (secondary)
-        if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
-        elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['rating'] >= 4.0]
-        
-        # 3. Filter by price (tertiary)
-        if 'max_price' in filters:
-            data = data[data['price'] <= filters['max_price']]
-        
-        # 4. Filter by location (quaternary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['location'].apply(lambda x: bool(location_pattern.search(str(x))))]
-        
-        return data
+        return self._apply_hotel_filters(data, filters, ('category', 'min_rating', 'max_price', 'location'))
     
     def _filter_location_hotels(self, data, filters):
         """
         Filter for location-based hotels.
         Priority: location → rating ≥ X → price ≤ Y → amenities
         """
-        # 1. Filter by location (primary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['location'].apply(lambda x: bool(location_pattern.search(str(x))))]
-        
-        # 2. Filter by rating (secondary)
-        if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
-        elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['rating'] >= 4.0]
-        
-        # 3. Filter by price (tertiary)
-        if 'max_price' in filters:
-            data = data[data['price'] <= filters['max_price']]
-        
-        # 4. Filter by amenities (quaternary)
-        if 'amenities' in filters and filters['amenities']:
-            for amenity in filters['amenities']:
-                amenity_pattern = re.compile(amenity, re.IGNORECASE)
-                data = data[data['amenities'].apply(lambda x: bool(amenity_pattern.search(str(x))))]
-        
-        return data
+        return self._apply_hotel_filters(data, filters, ('location', 'min_rating', 'max_price', 'amenities'))
     
     def _filter_price_quality_mix_hotels(self, data, filters):
         """
@@ -674,68 +916,49 @@ class RecommendationEngine:
         """
         # 1. Filter by rating (primary)
         if 'min_rating' in filters:
-            data = data[data['rating'] >= filters['min_rating']]
+            mask = data['rating'].to_numpy() >= filters['min_rating']
         elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['rating'] >= 4.0]
+            mask = data['rating'].to_numpy() >= 4.0
         else:
             # Default to 3.5+ rating for "quality" if not specified
-            data = data[data['rating'] >= 3.5]
-        
-        # 2. Filter by price (secondary)
-        if 'max_price' in filters:
-            data = data[data['price'] <= filters['max_price']]
+            mask = data['rating'].to_numpy() >= 3.5
         
-        # 3. Filter by location (tertiary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            data = data[data['location'].apply(lambda x: bool(location_pattern.search(str(x))))]
-        
-        # 4. Filter by amenities (quaternary)
-        if 'amenities' in filters and filters['amenities']:
-            for amenity in filters['amenities']:
-                amenity_pattern = re.compile(amenity, re.IGNORECASE)
-                data = data[data['amenities'].apply(lambda x: bool(amenity_pattern.search(str(x))))]
-        
-        return data
+        # 2-4. Filter by price, location and amenities
+        return self._apply_hotel_filters(data, filters, ('max_price', 'location', 'amenities'), mask)
     
-    def _sort_hotels_by_intent(self, data, intent):
-        """Sort filtered hotels based on the intent."""
+    def _sort_hotels_by_intent(self, data, intent, max_results):
+        """Select the top max_results filtered hotels based on the intent."""
         if not data.empty:
             if intent == 'cheap':
                 # Sort by price (ascending), then rating (descending)
-                return data.sort_values(['price', 'rating'], ascending=[True, False])
+                return _top_rows(data, ['price', 'rating'], [True, False], max_results)
             
             elif intent == 'expensive':
                 # Sort by price (descending), then rating (descending)
-                return data.sort_values(['price', 'rating'], ascending=[False, False])
+                return _top_rows(data, ['price', 'rating'], [False, False], max_results)
             
             elif intent == 'best':
                 # Sort by rating (descending)
-                return data.sort_values('rating', ascending=False)
+                return _top_rows(data, ['rating'], [False], max_results)
             
             elif intent == 'worst':
                 # Sort by rating (ascending), then price (descending)
-                return data.sort_values(['rating', 'price'], ascending=[True, False])
+                return _top_rows(data, ['rating', 'price'], [True, False], max_results)
             
             elif intent == 'location' or intent == 'category' or intent == 'amenities':
                 # Sort by rating (descending), then price (ascending)
-                return data.sort_values(['rating', 'price'], ascending=[False, True])
+                return _top_rows(data, ['rating', 'price'], [False, True], max_results)
             
             else:  # price_quality_mix
                 # Calculate a score based on rating and price
-                if 'score' not in data.columns:
-                    # Normalize price to 0-1 scale (inverted so lower is better)
-                    max_price = data['price'].max() if data['price'].max() > 0 else 1
-                    norm_price = 1 - (data['price'] / max_price)
-                    
-                    # Normalize rating to 0-1 scale
-                    norm_rating = data['rating'] / 5
-                    
-                    # Combine for a value score (70% rating, 30% price)
-                    data['score'] = (0.7 * norm_rating) + (0.3 * norm_price)
+                if 'score' in data.columns:
+                    score = data['score'].to_numpy()
+                else:
+                    score = _value_score(data['price'].to_numpy(), data['rating_norm'].to_numpy())
                 
-                # Sort by the computed score (descending)
-                return data.sort_values('score', ascending=False)
+                # Select the best scores (descending), attaching the score to those rows only
+                top = _top_positions(score, max_results)
+                return data.iloc[top].assign(score=score[top])
         
         return data
     
@@ -750,6 +973,10 @@ class RecommendationEngine:
         Returns:
             list: List of formatted vehicle recommendations
         """
+        return self._recommend_cached(self._recommend_vehicles, filters, max_results)
+    
+    def _recommend_vehicles(self, filters, max_results):
+        """Run the vehicle filters and sort without consulting the result cache."""
         try:
             logger.info(f"Generating vehicle recommendations with filters: {filters}")
             self.suggested_alternatives = []  # Reset suggested alternatives
@@ -757,72 +984,36 @@ class RecommendationEngine:
             # Check for direct vehicle name search
             original_query = filters.get('query', '').lower()
             
-            # First try to find exact vehicle name matches in the query
-            for _, vehicle in self.vehicles_data.iterrows():
-                vehicle_name = str(vehicle.get('name', '')).lower()
+            # First try to find exact vehicle name matches in the query, or any
+            # Activa for queries mentioning that popular model
+            position = _find_named_row(self._vehicle_names, original_query)
+            if 'activa' in original_query and self._first_activa is not None:
+                position = self._first_activa if position is None else min(position, self._first_activa)
+            
+            if position is not None:
+                vehicle = self.vehicles_data.iloc[[position]].to_dict('records')[0]
+                logger.info(f"Found vehicle name in query: {str(vehicle['name']).lower()}")
                 
-                # Check for exact name matches or partial matches for specific popular models
-                if (vehicle_name and len(vehicle_name) > 3 and vehicle_name in original_query) or \
-                   ('activa' in original_query and 'activa' in vehicle_name):
-                    logger.info(f"Found vehicle name in query: {vehicle_name}")
-                    
-                    # Special case for Activa
-                    if 'activa' in vehicle_name:
-                        vehicle_row = self.vehicles_data[self.vehicles_data['name'].str.lower().str.contains('activa')]
-                    else:
-                        vehicle_row = self.vehicles_data[self.vehicles_data['name'].str.lower() == vehicle_name]
-                        
-                    if not vehicle_row.empty:
-                        # Return the specific vehicle
-                        logger.info(f"Returning specific vehicle by name: {vehicle_name}")
-                        return [format_vehicle(vehicle_row.iloc[0])]
+                # Return the specific vehicle
+                return [format_vehicle(vehicle)]
             
             # If no exact vehicle name match, proceed with normal filtering
-            filtered_data = self.vehicles_data.copy()
+            # Filtering and sorting return new frames, so the shared data is never modified
+            filtered_data = self.vehicles_data
             
             # Determine the filtering strategy based on intent
             intent = filters.get('intent', 'price_quality_mix')
             
             # Apply filters based on the intent
-            if intent == 'cheap':
-                # Case 1: Cheapest Rentals (pricePerDay ≤ X → type → Ratings → pickupLocation)
-                filtered_data = self._filter_cheap_vehicles(filtered_data, filters)
-            
-            elif intent == 'expensive':
-                # Case 2: Most Expensive Rental (pricePerDay = max → type → Ratings → capacity)
-                filtered_data = self._filter_expensive_vehicles(filtered_data, filters)
-            
-            elif intent == 'best':
-                # Case 3: Top-Rated Vehicles (Ratings ≥ X → type → pricePerDay → capacity)
-                filtered_data = self._filter_best_vehicles(filtered_data, filters)
-            
-            elif intent == 'worst':
-                # Case 4: Low-Rated Vehicles (Ratings ≤ X → type → pricePerDay → capacity)
-                filtered_data = self._filter_worst_vehicles(filtered_data, filters)
-            
-            elif intent == 'type':
-                # Case 5: Type-Based (type → pricePerDay → Ratings → pickupLocation)
-                filtered_data = self._filter_type_vehicles(filtered_data, filters)
-            
-            elif intent == 'capacity':
-                # Case 6: Capacity-Based (Passengers ≥ N → type → pricePerDay → Ratings)
-                filtered_data = self._filter_capacity_vehicles(filtered_data, filters)
-            
-            elif intent == 'location':
-                # Case 7: Location-Based (pickupLocation/dropOffLocation → type → pricePerDay → Ratings)
-                filtered_data = self._filter_location_vehicles(filtered_data, filters)
-            
-            else:  # price_quality_mix
-                # Case 8: Price+Quality Mix (Ratings ≥ X → pricePerDay ≤ Y → type → capacity)
-                filtered_data = self._filter_price_quality_mix_vehicles(filtered_data, filters)
+            filter_method = getattr(self, self._VEHICLE_FILTERS.get(intent, '_filter_price_quality_mix_vehicles'))
+            filtered_data = filter_method(filtered_data, filters)
             
             # Sort results based on the intent
-            filtered_data = self._sort_vehicles_by_intent(filtered_data, intent)
+            filtered_data = self._sort_vehicles_by_intent(filtered_data, intent, max_results)
             
             # Format results for display
-            results = []
-            for _, row in filtered_data.head(max_results).iterrows():
-                results.append(format_vehicle(row))
+            records = filtered_data.head(max_results).to_dict('records')
+            results = [format_vehicle(record) for record in records]
             
             logger.info(f"Found {len(results)} vehicle recommendations")
             return results
@@ -831,37 +1022,62 @@ class RecommendationEngine:
             logger.error(f"Error generating vehicle recommendations: {str(e)}")
             return []
             
+    def _apply_vehicle_filters(self, data, filters, steps, mask=None):
+        """
+        Apply the optional vehicle filters in priority order.
+        
+        Args:
+            data (pd.DataFrame): Vehicles to filter
+            filters (dict): Dictionary of filters
+            steps (tuple): Filters to apply in order, from 'vehicle_type', 'min_rating',
+                'max_price', 'min_price', 'passengers' and 'location' (pickup only)
+            mask (numpy.ndarray): Rows already selected by the intent's primary filter, if any
+            
+        Returns:
+            pd.DataFrame: The vehicles passing every step whose filter is set
+        """
+        # Combine the steps into one mask so the rows are only selected once
+        if mask is None:
+            mask = np.ones(len(data), dtype=bool)
+        for step in steps:
+            if step == 'vehicle_type':
+                if 'vehicle_type' in filters and filters['vehicle_type']:
+                    mask &= self._matching_rows(data, 'type', filters['vehicle_type'])
+            elif step == 'min_rating':
+                if 'min_rating' in filters:
+                    mask &= data['Ratings'].to_numpy() >= filters['min_rating']
+                elif 'rating_level' in filters and filters['rating_level'] == 'high':
+                    mask &= data['Ratings'].to_numpy() >= 4.0
+            elif step == 'max_price':
+                if 'max_price' in filters:
+                    mask &= data['pricePerDay'].to_numpy() <= filters['max_price']
+            elif step == 'min_price':
+                if 'min_price' in filters:
+                    mask &= data['pricePerDay'].to_numpy() >= filters['min_price']
+            elif step == 'passengers':
+                if 'passengers' in filters and filters['passengers']:
+                    mask &= data['Passengers'].to_numpy() >= filters['passengers']
+            elif step == 'location':
+                if 'location' in filters:
+                    mask &= self._matching_rows(data, 'pickupLocation', filters['location'])
+        
+        return data[mask]
+    
     def _filter_cheap_vehicles(self, data, filters):
         """
         Filter for cheap vehicles.
         Priority: pricePerDay ≤ X → type → Ratings → pickupLocation
         """
         # 1. Filter by price (primary)
+        mask = None
         if 'max_price' in filters:
-            data = data[data['pricePerDay'] <= filters['max_price']]
+            mask = self._price_range_mask(data, 'pricePerDay', max_price=filters['max_price'])
         elif 'price_level' in filters and filters['price_level'] == 'cheap':
             # Use a reasonable default for "cheap" if no specific price given
-            data = data.sort_values('pricePerDay')
-            data = data.head(int(len(data) * 0.3))  # Top 30% cheapest
-        
-        # 2. Filter by vehicle type (secondary)
-        if 'vehicle_type' in filters and filters['vehicle_type']:
-            type_pattern = re.compile(filters['vehicle_type'], re.IGNORECASE)
-            data = data[data['type'].apply(lambda x: bool(type_pattern.search(str(x))))]
-        
-        # 3. Filter by rating (tertiary)
-        if 'min_rating' in filters:
-            data = data[data['Ratings'] >= filters['min_rating']]
-        elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['Ratings'] >= 4.0]
-        
-        # 4. Filter by pickup location (quaternary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            pickup_match = data['pickupLocation'].apply(lambda x: bool(location_pattern.search(str(x))))
-            data = data[pickup_match]
+            data = self._price_share(data, 'pricePerDay', ascending=True)  # Top 30% cheapest
         
-        return data
+        # 2-4. Filter by vehicle type, rating and pickup location
+        return self._apply_vehicle_filters(data, filters, ('vehicle_type', 'min_rating', 'location'), mask)
     
     def _filter_expensive_vehicles(self, data, filters):
         """
@@ -869,29 +1085,15 @@ class RecommendationEngine:
         Priority: pricePerDay = max → type → Ratings → capacity
         """
         # 1. Filter by price (primary)
+        mask = None
         if 'min_price' in filters:
-            data = data[data['pricePerDay'] >= filters['min_price']]
+            mask = self._price_range_mask(data, 'pricePerDay', min_price=filters['min_price'])
         elif 'price_level' in filters and filters['price_level'] == 'expensive':
             # Use a reasonable default for "expensive" if no specific price given
-            data = data.sort_values('pricePerDay', ascending=False)
-            data = data.head(int(len(data) * 0.3))  # Top 30% most expensive
-        
-        # 2. Filter by vehicle type (secondary)
-        if 'vehicle_type' in filters and filters['vehicle_type']:
-            type_pattern = re.compile(filters['vehicle_type'], re.IGNORECASE)
-            data = data[data['type'].apply(lambda x: bool(type_pattern.search(str(x))))]
+            data = self._price_share(data, 'pricePerDay', ascending=False)  # Top 30% most expensive
         
-        # 3. Filter by rating (tertiary)
-        if 'min_rating' in filters:
-            data = data[data['Ratings'] >= filters['min_rating']]
-        elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['Ratings'] >= 4.0]
-        
-        # 4. Filter by passenger capacity (quaternary)
-        if 'passengers' in filters and filters['passengers']:
-            data = data[data['Passengers'] >= filters['passengers']]
-        
-        return data
+        # 2-4. Filter by vehicle type, rating and passenger capacity
+        return self._apply_vehicle_filters(data, filters, ('vehicle_type', 'min_rating', 'passengers'), mask)
     
     def _filter_best_vehicles(self, data, filters):
         """
@@ -900,27 +1102,15 @@ class RecommendationEngine:
         """
         # 1. Filter by rating (primary)
         if 'min_rating' in filters:
-            data = data[data['Ratings'] >= filters['min_rating']]
+            mask = data['Ratings'].to_numpy() >= filters['min_rating']
         elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['Ratings'] >= 4.0]
+            mask = data['Ratings'].to_numpy() >= 4.0
         else:
             # Default to 4.0+ rating for "best" if not specified
-            data = data[data['Ratings'] >= 4.0]
+            mask = data['Ratings'].to_numpy() >= 4.0
         
-        # 2. Filter by vehicle type (secondary)
-        if 'vehicle_type' in filters and filters['vehicle_type']:
-            type_pattern = re.compile(filters['vehicle_type'], re.IGNORECASE)
-            data = data[data['type'].apply(lambda x: bool(type_pattern.search(str(x))))]
-        
-        # 3. Filter by price (tertiary, optional)
-        if 'max_price' in filters:
-            data = data[data['pricePerDay'] <= filters['max_price']]
-        
-        # 4. Filter by passenger capacity (quaternary)
-        if 'passengers' in filters and filters['passengers']:
-            data = data[data['Passengers'] >= filters['passengers']]
-        
-        return data
+        # 2-4. Filter by vehicle type, price and passenger capacity
+        return self._apply_vehicle_filters(data, filters, ('vehicle_type', 'max_price', 'passengers'), mask)
     
     def _filter_worst_vehicles(self, data, filters):
         """
@@ -929,81 +1119,29 @@ class RecommendationEngine:
         """
         # 1. Filter by rating (primary)
         if 'max_rating' in filters:
-            data = data[data['Ratings'] <= filters['max_rating']]
+            mask = data['Ratings'].to_numpy() <= filters['max_rating']
         elif 'rating_level' in filters and filters['rating_level'] == 'low':
-            data = data[data['Ratings'] <= 3.0]
+            mask = data['Ratings'].to_numpy() <= 3.0
         else:
             # Default to 3.0- rating for "worst" if not specified
-            data = data[data['Ratings'] <= 3.0]
+            mask = data['Ratings'].to_numpy() <= 3.0
         
-        # 2. Filter by vehicle type (secondary)
-        if 'vehicle_type' in filters and filters['vehicle_type']:
-            type_pattern = re.compile(filters['vehicle_type'], re.IGNORECASE)
-            data = data[data['type'].apply(lambda x: bool(type_pattern.search(str(x))))]
-        
-        # 3. Filter by price (tertiary, optional)
-        if 'min_price' in filters:
-            data = data[data['pricePerDay'] >= filters['min_price']]
-        
-        # 4. Filter by passenger capacity (quaternary)
-        if 'passengers' in filters and filters['passengers']:
-            data = data[data['Passengers'] >= filters['passengers']]
-        
-        return data
+        # 2-4. Filter by vehicle type, price and passenger capacity
+        return self._apply_vehicle_filters(data, filters, ('vehicle_type', 'min_price', 'passengers'), mask)
     
     def _filter_type_vehicles(self, data, filters):
         """
         Filter for type-based vehicles.
         Priority: type → pricePerDay → Ratings → pickupLocation
         """
-        # 1. Filter by vehicle type (primary)
-        if 'vehicle_type' in filters and filters['vehicle_type']:
-            type_pattern = re.compile(filters['vehicle_type'], re.IGNORECASE)
-            data = data[data['type'].apply(lambda x: bool(type_pattern.search(str(x))))]
-        
-        # 2. Filter by price (secondary)
-        if 'max_price' in filters:
-            data = data[data['pricePerDay'] <= filters['max_price']]
-        
-        # 3. Filter by rating (tertiary)
-        if 'min_rating' in filters:
-            data = data[data['Ratings'] >= filters['min_rating']]
-        elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['Ratings'] >= 4.0]
-        
-        # 4. Filter by pickup location (quaternary)
-        if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            pickup_match = data['pickupLocation'].apply(lambda x: bool(location_pattern.search(str(x))))
-            data = data[pickup_match]
-        
-        return data
+        return self._apply_vehicle_filters(data, filters, ('vehicle_type', 'max_price', 'min_rating', 'location'))
     
     def _filter_capacity_vehicles(self, data, filters):
         """
         Filter for capacity-based vehicles.
         Priority: Passengers ≥ N → type → pricePerDay → Ratings
         """
-        # 1. Filter by passenger capacity (primary)
-        if 'passengers' in filters and filters['passengers']:
-            data = data[data['Passengers'] >= filters['passengers']]
-        
-        # 2. Filter by vehicle type (secondary)
-        if 'vehicle_type' in filters and filters['vehicle_type']:
-            type_pattern = re.compile(filters['vehicle_type'], re.IGNORECASE)
-            data = data[data['type'].apply(lambda x: bool(type_pattern.search(str(x))))]
-        
-        # 3. Filter by price (tertiary)
-        if 'max_price' in filters:
-            data = data[data['pricePerDay'] <= filters['max_price']]
-        
-        # 4. Filter by rating (quaternary)
-        if 'min_rating' in filters:
-            data = data[data['Ratings'] >= filters['min_rating']]
-        elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['Ratings'] >= 4.0]
-        
-        return data
+        return self._apply_vehicle_filters(data, filters, ('passengers', 'vehicle_type', 'max_price', 'min_rating'))
     
     def _filter_location_vehicles(self, data, filters):
         """
@@ -1011,28 +1149,14 @@ class RecommendationEngine:
         Priority: pickupLocation/dropOffLocation → type → pricePerDay → Ratings
         """
         # 1. Filter by location (primary)
+        mask = None
         if 'location' in filters:
-            location_pattern = re.compile(filters['location'], re.IGNORECASE)
-            pickup_match = data['pickupLocation'].apply(lambda x: bool(location_pattern.search(str(x))))
-            dropoff_match = data['dropOffLocation'].apply(lambda x: bool(location_pattern.search(str(x))))
-            data = data[pickup_match | dropoff_match]
-        
-        # 2. Filter by vehicle type (secondary)
-        if 'vehicle_type' in filters and filters['vehicle_type']:
-            type_pattern = re.compile(filters['vehicle_type'], re.IGNORECASE)
-            data = data[data['type'].apply(lambda x: bool(type_pattern.search(str(x))))]
-        
-        # 3. Filter by price (tertiary)
-        if 'max_price' in filters:
-            data = data[data['pricePerDay'] <= filters['max_price']]
+            pickup_match = self._matching_rows(data, 'pickupLocation', filters['location'])
+            dropoff_match = self._matching_rows(data, 'dropOffLocation', filters['location'])
+            mask = pickup_match | dropoff_match
         
-        # 4. Filter by rating (quaternary)
-        if 'min_rating' in filters:
-            data = data[data['Ratings'] >= filters['min_rating']]
-        elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['Ratings'] >= 4.0]
-        
-        return data
+        # 2-4. Filter by vehicle type, price and rating
+        return self._apply_vehicle_filters(data, filters, ('vehicle_type', 'max_price', 'min_rating'), mask)
     
     def _filter_price_quality_mix_vehicles(self, data, filters):
         """
@@ -1041,65 +1165,48 @@ class RecommendationEngine:
         """
         # 1. Filter by rating (primary)
         if 'min_rating' in filters:
-            data = data[data['Ratings'] >= filters['min_rating']]
+            mask = data['Ratings'].to_numpy() >= filters['min_rating']
         elif 'rating_level' in filters and filters['rating_level'] == 'high':
-            data = data[data['Ratings'] >= 4.0]
+            mask = data['Ratings'].to_numpy() >= 4.0
         else:
             # Default to 3.5+ rating for "quality" if not specified
-            data = data[data['Ratings'] >= 3.5]
+            mask = data['Ratings'].to_numpy() >= 3.5
         
-        # 2. Filter by price (secondary)
-        if 'max_price' in filters:
-            data = data[data['pricePerDay'] <= filters['max_price']]
-        
-        # 3. Filter by vehicle type (tertiary)
-        if 'vehicle_type' in filters and filters['vehicle_type']:
-            type_pattern = re.compile(filters['vehicle_type'], re.IGNORECASE)
-            data = data[data['type'].apply(lambda x: bool(type_pattern.search(str(x))))]
-        
-        # 4. Filter by passenger capacity (quaternary)
-        if 'passengers' in filters and filters['passengers']:
-            data = data[data['Passengers'] >= filters['passengers']]
-        
-        return data
+        # 2-4. Filter by price, vehicle type and passenger capacity
+        return self._apply_vehicle_filters(data, filters, ('max_price', 'vehicle_type', 'passengers'), mask)
     
-    def _sort_vehicles_by_intent(self, data, intent):
-        """Sort filtered vehicles based on the intent."""
+    def _sort_vehicles_by_intent(self, data, intent, max_results):
+        """Select the top max_results filtered vehicles based on the intent."""
         if not data.empty:
             if intent == 'cheap':
                 # Sort by price (ascending), then rating (descending)
-                return data.sort_values(['pricePerDay', 'Ratings'], ascending=[True, False])
+                return _top_rows(data, ['pricePerDay', 'Ratings'], [True, False], max_results)
             
             elif intent == 'expensive':
                 # Sort by price (descending), then rating (descending)
-                return data.sort_values(['pricePerDay', 'Ratings'], ascending=[False, False])
+                return _top_rows(data, ['pricePerDay', 'Ratings'], [False, False], max_results)
             
             elif intent == 'best':
                 # Sort by rating (descending), then price (ascending)
-                return data.sort_values(['Ratings', 'pricePerDay'], ascending=[False, True])
+                return _top_rows(data, ['Ratings', 'pricePerDay'], [False, True], max_results)
             
             elif intent == 'worst':
                 # Sort by rating (ascending), then price (descending)
-                return data.sort_values(['Ratings', 'pricePerDay'], ascending=[True, False])
+                return _top_rows(data, ['Ratings', 'pricePerDay'], [True, False], max_results)
             
             elif intent in ['type', 'location', 'capacity']:
                 # Sort by rating (descending), then price (ascending)
-                return data.sort_values(['Ratings', 'pricePerDay'], ascending=[False, True])
+                return _top_rows(data, ['Ratings', 'pricePerDay'], [False, True], max_results)
             
             else:  # price_quality_mix
                 # Calculate a score based on rating and price
-                if 'score' not in data.columns:
-                    # Normalize price to 0-1 scale (inverted so lower is better)
-                    max_price = data['pricePerDay'].max() if data['pricePerDay'].max() > 0 else 1
-                    norm_price = 1 - (data['pricePerDay'] / max_price)
-                    
-                    # Normalize rating to 0-1 scale
-                    norm_rating = data['Ratings'] / 5
-                    
-                    # Combine for a value score (70% rating, 30% price)
-                    data['score'] = (0.7 * norm_rating) + (0.3 * norm_price)
+                if 'score' in data.columns:
+                    score = data['score'].to_numpy()
+                else:
+                    score = _value_score(data['pricePerDay'].to_numpy(), data['rating_norm'].to_numpy())
                 
-                # Sort by the computed score (descending)
-                return data.sort_values('score', ascending=False)
+                # Select the best scores (descending), attaching the score to those rows only
+                top = _top_positions(score, max_results)
+                return data.iloc[top].assign(score=score[top])
         
         return data
@@ -28,6 +28,9 @@ app.post('/api/recommendations', (req, res) => {
   let result = '';
   let error = '';
 
+  // Decode as UTF-8 across chunk boundaries; the JSON output is not ASCII-escaped
+  pythonProcess.stdout.setEncoding('utf8');
+
   pythonProcess.stdout.on('data', (data) => {
     result += data.toString();
   });
@@ -20,7 +20,7 @@ restaurants_data = data_loader.load_restaurants_data()
 hotels_data = data_loader.load_hotels_data()
 vehicles_data = data_loader.load_vehicles_data()
 
-nlp_processor = NLPProcessor()
+nlp_processor = NLPProcessor(hotels_data['name'], vehicles_data['name'])
 recommendation_engine = RecommendationEngine(restaurants_data, hotels_data, vehicles_data)
 
 def test_activa_lookup():
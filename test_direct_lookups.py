@@ -3,6 +3,7 @@ Test the direct name lookup functionality for hotels and vehicles
 """
 import logging
 import sys
+import pytest
 from data_loader import DataLoader
 from nlp_processor import NLPProcessor
 from recommendation_engine import RecommendationEngine
@@ -14,17 +15,29 @@ logging.basicConfig(
     stream=sys.stdout
 )
 
-# Create instances
-data_loader = DataLoader()
-restaurants_data = data_loader.load_restaurants_data()
-hotels_data = data_loader.load_hotels_data()
-vehicles_data = data_loader.load_vehicles_data()
+def create_engine():
+    """Load the datasets and build a recommendation engine over them."""
+    data_loader = DataLoader()
+    restaurants_data = data_loader.load_restaurants_data()
+    hotels_data = data_loader.load_hotels_data()
+    vehicles_data = data_loader.load_vehicles_data()
+    return RecommendationEngine(restaurants_data, hotels_data, vehicles_data)
 
-nlp_processor = NLPProcessor()
-recommendation_engine = RecommendationEngine(restaurants_data, hotels_data, vehicles_data)
+def create_nlp_processor(engine):
+    """Build an NLP processor that recognizes the names in the engine's data."""
+    return NLPProcessor(engine.hotels_data['name'], engine.vehicles_data['name'])
+
+# The datasets are only loaded once a test needs them, and then shared by every test
+@pytest.fixture(scope="session")
+def recommendation_engine():
+    return create_engine()
+
+@pytest.fixture(scope="session")
+def nlp_processor(recommendation_engine):
+    return create_nlp_processor(recommendation_engine)
 
 # Test hotel direct lookup
-def test_hotel_name_lookup():
+def test_hotel_name_lookup(recommendation_engine, nlp_processor):
     print("\n=== Testing hotel name lookup ===")
     query = "Tell me about The Oberoi Mumbai"
     print(f"Query: {query}")
@@ -42,7 +55,7 @@ def test_hotel_name_lookup():
         print(f"Error: Query type detected as {query_type}, expected 'hotel'")
 
 # Test vehicle direct lookup
-def test_vehicle_name_lookup():
+def test_vehicle_name_lookup(recommendation_engine, nlp_processor):
     print("\n=== Testing vehicle name lookup ===")
     query = "I want to rent a Toyota Fortuner"
     print(f"Query: {query}")
@@ -60,5 +73,7 @@ def test_vehicle_name_lookup():
         print(f"Error: Query type detected as {query_type}, expected 'vehicle'")
 
 if __name__ == "__main__":
-    test_hotel_name_lookup()
-    test_vehicle_name_lookup()
\ No newline at end of file
+    engine = create_engine()
+    processor = create_nlp_processor(engine)
+    test_hotel_name_lookup(engine, processor)
+    test_vehicle_name_lookup(engine, processor)
\ No newline at end of file
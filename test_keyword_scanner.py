@@ -0,0 +1,48 @@
+"""
+Test the single-pass keyword scanner against plain substring and word-boundary searches
+"""
+import random
+import re
+from keyword_scanner import KeywordScanner
+
+def _expected(keywords, query, whole_words):
+    if whole_words:
+        return {keyword for keyword in keywords if re.search(r'\b' + re.escape(keyword) + r'\b', query)}
+    return {keyword for keyword in keywords if keyword in query}
+
+def test_substring_matches():
+    scanner = KeywordScanner({'food': ['pizza', 'pizzeria', 'izz'], 'drink': ['tea', 'team']})
+    hits = scanner.scan('pizzeria team')
+    assert hits == {'food': {'pizzeria', 'izz'}, 'drink': {'tea', 'team'}}
+
+def test_whole_word_matches():
+    scanner = KeywordScanner({'amenity': ['pool', 'pool table', 'spa', 'a/c']}, whole_words=True)
+    assert scanner.matches('spacious pool table') == {'pool', 'pool table'}
+    assert scanner.matches('room with a/c and spa') == {'a/c', 'spa'}
+
+def test_whole_words_with_non_word_edges():
+    # Keywords starting or ending with punctuation are still reported
+    keywords = ['/', 'a/c ', 'b-', '-x']
+    scanner = KeywordScanner({'tag': keywords}, whole_words=True)
+    for query in ['a/b', 'x a/c y', 'b-a', 'a-x', 'a/c b-c']:
+        assert scanner.matches(query) == _expected(keywords, query, True)
+
+def test_matches_plain_searches():
+    rng = random.Random(0)
+    alphabet = 'ab /-c'
+    for _ in range(1000):
+        keywords = list({
+            ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 6))
+        })
+        for whole_words in (False, True):
+            scanner = KeywordScanner({'tag': keywords}, whole_words=whole_words)
+            for _ in range(5):
+                query = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+                assert scanner.matches(query) == _expected(keywords, query, whole_words)
+
+def test_first_keyword_in_query():
+    scanner = KeywordScanner({'location': ['fort', 'juhu', 'bandra', 'vile parle']}, whole_words=True)
+    assert scanner.first('hotel in juhu near bandra') == 'juhu'
+    assert scanner.first('comfortable stay in vile parle') == 'vile parle'
+    assert scanner.first('comfortable stay') is None
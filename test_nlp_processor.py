@@ -0,0 +1,28 @@
+"""
+Test filter extraction in the NLP processor
+"""
+import pytest
+from nlp_processor import NLPProcessor
+
+def test_location_only_matches_whole_words():
+    # "comfortable" contains "fort", which must not count as the location
+    query_type, filters = NLPProcessor([], []).process_query("comfortable hotel in virar")
+    assert filters['location'] == 'virar'
+
+def test_location_takes_the_first_in_the_query():
+    query_type, filters = NLPProcessor([], []).process_query("cheap hotel in juhu near bandra")
+    assert filters['location'] == 'juhu'
+
+def test_multi_word_locations():
+    processor = NLPProcessor([], [])
+    assert processor.process_query("restaurants in vile parle")[1]['location'] == 'vile parle'
+    assert processor.process_query("hotel near marine lines")[1]['location'] == 'marine lines'
+
+def test_name_lookup_routes_to_the_entity():
+    processor = NLPProcessor(['The Oberoi Mumbai'], ['Toyota Fortuner'])
+    assert processor.process_query("Tell me about The Oberoi Mumbai")[0] == 'hotel'
+    assert processor.process_query("I want to rent a Toyota Fortuner")[0] == 'vehicle'
+
+def test_names_are_required():
+    with pytest.raises(TypeError):
+        NLPProcessor()
@@ -0,0 +1,47 @@
+"""
+Test the ranking helpers of the recommendation engine
+"""
+import numpy as np
+import pandas as pd
+from recommendation_engine import _top_positions, _top_rows, _value_score
+
+def test_top_rows_with_few_ranked_values():
+    # Fewer non-NaN values than requested rows must not drop the real rows
+    data = pd.DataFrame({'a': [1.0] + [np.nan] * 6, 'b': range(7)})
+    for ascending in ([True, False], [False, True]):
+        expected = data.sort_values(['a', 'b'], ascending=ascending, kind='stable').head(5)
+        result = _top_rows(data, ['a', 'b'], ascending, 5)
+        assert result.equals(expected)
+        assert result['a'].iloc[0] == 1.0
+
+def test_top_rows_matches_stable_sort():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        size = int(rng.integers(1, 30))
+        first = rng.integers(0, 5, size).astype(float)
+        first[rng.random(size) < 0.3] = np.nan
+        data = pd.DataFrame({'a': first, 'b': rng.integers(0, 3, size)})
+        ascending = [bool(rng.integers(2)), bool(rng.integers(2))]
+        n = int(rng.integers(1, 8))
+        
+        expected = data.sort_values(['a', 'b'], ascending=ascending, kind='stable').head(n)
+        assert _top_rows(data, ['a', 'b'], ascending, n).equals(expected)
+
+def test_value_score_skips_missing_prices():
+    prices = np.array([100.0, np.nan, 300.0])
+    ratings = np.array([0.8, 0.6, 0.9])
+    score = _value_score(prices, ratings)
+    
+    # The maximum comes from the known prices, as with Series.max
+    assert np.allclose(score[[0, 2]], [0.7 * 0.8 + 0.3 * (1 - 100 / 300), 0.7 * 0.9])
+    assert np.isnan(score[1])
+
+def test_ties_keep_index_order():
+    # Equal ratings and scores are returned in their original row order
+    data = pd.DataFrame({'rating': [4.5, 4.8, 4.5, 4.8, 4.5, 4.8, 4.0]}, index=[10, 11, 12, 13, 14, 15, 16])
+    assert list(_top_rows(data, ['rating'], [False], 4).index) == [11, 13, 15, 10]
+    assert list(_top_rows(data, ['rating'], [True], 3).index) == [16, 10, 12]
+    
+    scores = np.array([0.5, 0.9, 0.5, 0.9, np.nan, 0.9, 0.5])
+    assert list(_top_positions(scores, 5)) == [1, 3, 5, 0, 2]
+    assert list(_top_positions(scores, 7)) == [1, 3, 5, 0, 2, 6, 4]
@@ -3,12 +3,59 @@ Utility functions for formatting and displaying recommendation results.
 """
 import textwrap
 
+# Star strings for every whole-star count a 0-5 rating can have, with and without a half star
+_STARS = {
+    (full_stars, half_star): "★" * full_stars + ("½" if half_star else "")
+    for full_stars in range(6)
+    for half_star in (False, True)
+}
+
+# Shared wrapper for the 60-column display text, built once rather than per call
+_WRAPPER = textwrap.TextWrapper(width=60)
+
+def _wrap(text):
+    """
+    Wrap text to 60 columns, as textwrap.fill would.
+    
+    Args:
+        text (str): Text to wrap
+        
+    Returns:
+        str: The wrapped text
+    """
+    # Short single-line text without surrounding whitespace comes back unchanged
+    if (isinstance(text, str) and len(text) <= 60 and text == text.strip()
+            and not any(char in text for char in '\t\n\x0b\x0c\r')):
+        return text
+    return _WRAPPER.fill(text)
+
+def _rating_stars(rating):
+    """
+    Render a rating as stars.
+    
+    Args:
+        rating (float): Rating on a 0-5 scale, possibly NaN
+        
+    Returns:
+        str: Stars for the rating, or "No ratings" if it is missing
+    """
+    if not rating or rating != rating:  # Check for NaN
+        return "No ratings"
+    
+    full_stars = int(rating)
+    half_star = round(rating - full_stars) >= 0.5
+    stars = _STARS.get((full_stars, half_star))
+    if stars is None:
+        # Out of the usual range, so build the string directly
+        stars = "★" * full_stars + ("½" if half_star else "")
+    return stars
+
 def format_restaurant(restaurant):
     """
     Format restaurant data for display.
     
     Args:
-        restaurant (pd.Series): Restaurant data
+        restaurant (dict or pd.Series): Restaurant data
         
     Returns:
         str: Formatted restaurant information
@@ -26,12 +73,7 @@ def format_restaurant(restaurant):
     
     # Calculate rating stars
     rating = restaurant['rating'] if not restaurant.get('score') else restaurant['score'] * 5
-    if not rating or rating != rating:  # Check for NaN
-        rating_stars = "No ratings"
-    else:
-        full_stars = int(rating)
-        half_star = round(rating - full_stars) >= 0.5
-        rating_stars = "★" * full_stars + ("½" if half_star else "")
+    rating_stars = _rating_stars(rating)
     
     # Get review count info
     review_count = restaurant.get('review_count', 0)
@@ -43,7 +85,7 @@ def format_restaurant(restaurant):
         cuisines = "Cuisine not specified"
     
     # Wrap address text
-    address = textwrap.fill(restaurant.get('address', 'Address not available'), width=60)
+    address = _wrap(restaurant.get('address', 'Address not available'))
     
     # Format phone number
     phone = restaurant.get('Phone', 'Phone not available')
@@ -60,24 +102,36 @@ def format_restaurant(restaurant):
     
     return formatted
 
+def format_amenities(amenities):
+    """
+    Clean up a hotel's amenities for display.
+    
+    Args:
+        amenities (str): Comma-separated amenities
+        
+    Returns:
+        str: The amenities joined with ", " and wrapped, or "Not specified" if there are none
+    """
+    if not amenities:
+        return "Not specified"
+    
+    # Try to clean up amenities - they might be in a CSV-like format
+    amenities_list = ', '.join(filter(None, map(str.strip, str(amenities).split(','))))
+    return _wrap(amenities_list)
+
 def format_hotel(hotel):
     """
     Format hotel data for display.
     
     Args:
-        hotel (pd.Series): Hotel data
+        hotel (dict or pd.Series): Hotel data
         
     Returns:
         str: Formatted hotel information
     """
     # Calculate rating stars
     rating = hotel['rating'] if not hotel.get('score') else hotel['score'] * 5
-    if not rating or rating != rating:  # Check for NaN
-        rating_stars = "No ratings"
-    else:
-        full_stars = int(rating)
-        half_star = round(rating - full_stars) >= 0.5
-        rating_stars = "★" * full_stars + ("½" if half_star else "")
+    rating_stars = _rating_stars(rating)
     
     # Process price
     price = f"₹{int(hotel['price'])}" if hotel.get('price') else "Price not available"
@@ -85,24 +139,17 @@ def format_hotel(hotel):
     # Process category
     category = hotel.get('category', 'Not specified')
     
-    # Process amenities
-    amenities = hotel.get('amenities', '')
-    if not amenities:
-        amenities_list = "Not specified"
-    else:
-        # Try to clean up amenities - they might be in a CSV-like format
-        amenities = str(amenities)
-        amenities_list = ', '.join([a.strip() for a in amenities.split(',') if a.strip()])
-        amenities_list = textwrap.fill(amenities_list, width=60)
+    # Use the amenities cleaned up when the data was loaded, or clean them up now
+    amenities_list = hotel.get('amenities_text') or format_amenities(hotel.get('amenities', ''))
     
     # Process location
     location = hotel.get('location', 'Location not available')
-    location = textwrap.fill(location, width=60)
+    location = _wrap(location)
     
     # Process description (truncate if too long)
     description = hotel.get('description', '')
     if description:
-        description = textwrap.fill(description[:200] + '...' if len(description) > 200 else description, width=60)
+        description = _wrap(description[:200] + '...' if len(description) > 200 else description)
     else:
         description = "No description available"
     
@@ -119,24 +166,37 @@ def format_hotel(hotel):
     
     return formatted
 
+def extract_colors(model_info):
+    """
+    List the available colors in a vehicle's model information.
+    
+    Args:
+        model_info (dict): Parsed model information, with one dict per variant
+        
+    Returns:
+        str: Comma-separated colors, or "Not specified" if there are none
+    """
+    colors = []
+    if isinstance(model_info, dict):
+        for key, value in model_info.items():
+            if isinstance(value, dict) and 'color' in value:
+                colors.append(value['color'])
+    
+    return ", ".join(colors) if colors else "Not specified"
+
 def format_vehicle(vehicle):
     """
     Format vehicle data for display.
     
     Args:
-        vehicle (pd.Series): Vehicle data
+        vehicle (dict or pd.Series): Vehicle data
         
     Returns:
         str: Formatted vehicle information
     """
     # Calculate rating stars
     rating = vehicle.get('Ratings')
-    if not rating or rating != rating:  # Check for NaN
-        rating_stars = "No ratings"
-    else:
-        full_stars = int(rating)
-        half_star = round(rating - full_stars) >= 0.5
-        rating_stars = "★" * full_stars + ("½" if half_star else "")
+    rating_stars = _rating_stars(rating)
     
     # Process prices
     daily_price = f"₹{int(vehicle['pricePerDay'])}" if vehicle.get('pricePerDay') else "Not available"
@@ -151,23 +211,16 @@ def format_vehicle(vehicle):
     
     # Process locations
     pickup = vehicle.get('pickupLocation', 'Not specified')
-    pickup = textwrap.fill(pickup, width=60)
+    pickup = _wrap(pickup)
     
     dropoff = vehicle.get('dropOffLocation', 'Not specified')
-    dropoff = textwrap.fill(dropoff, width=60)
+    dropoff = _wrap(dropoff)
     
     # Extract model details
     model_name = vehicle.get('name', 'Not specified')
     
-    # Try to extract color information from model_info if available
-    model_info = vehicle.get('model_info', {})
-    colors = []
-    if isinstance(model_info, dict):
-        for key, value in model_info.items():
-            if isinstance(value, dict) and 'color' in value:
-                colors.append(value['color'])
-    
-    color_info = ", ".join(colors) if colors else "Not specified"
+    # Use the colors extracted when the data was loaded, or extract them from model_info
+    color_info = vehicle.get('color_info') or extract_colors(vehicle.get('model_info', {}))
     
     # Build the formatted string
     formatted = (